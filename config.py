@@ -1,16 +1,37 @@
 """Shared configuration for JustJoinIT pipeline"""
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 
-# LLM API Configuration (xAI, OpenAI, or any OpenAI-compatible endpoint)
-# Load from environment variables (see .env.example)
-LLM_BASE_URL = os.environ.get("LLM_BASE_URL", "https://api.x.ai/v1")
-LLM_MODEL = os.environ.get("LLM_MODEL", "grok-4-fast-non-reasoning")
-LLM_TIMEOUT = int(os.environ.get("LLM_TIMEOUT", "180"))
-LLM_API_KEY = os.environ.get("LLM_API_KEY")  # REQUIRED: Set in .env file
 
-if not LLM_API_KEY:
-    raise ValueError(
-        "LLM_API_KEY environment variable is required! "
-        "Copy .env.example to .env and set your API key."
+@dataclass(frozen=True)
+class Config:
+    """LLM API settings (xAI, OpenAI, or any OpenAI-compatible endpoint)"""
+
+    llm_base_url: str
+    llm_model: str
+    llm_timeout: int
+    llm_api_key: str
+    llm_json_mode: bool = True  # Send response_format=json_object (disable for servers without JSON mode)
+    llm_stream: bool = False  # Stream async completions over SSE (only avoids read timeouts, no speedup)
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Read configuration from environment variables once (see .env.example)"""
+    api_key = os.environ.get("LLM_API_KEY")  # REQUIRED: Set in .env file
+    if not api_key:
+        raise ValueError(
+            "LLM_API_KEY environment variable is required! "
+            "Copy .env.example to .env and set your API key."
+        )
+
+    return Config(
+        llm_base_url=os.environ.get("LLM_BASE_URL", "https://api.x.ai/v1"),
+        llm_model=os.environ.get("LLM_MODEL", "grok-4-fast-non-reasoning"),
+        llm_timeout=int(os.environ.get("LLM_TIMEOUT", "180")),
+        llm_api_key=api_key,
+        llm_json_mode=os.environ.get("LLM_JSON_MODE", "true").lower() not in ("0", "false", "no"),
+        llm_stream=os.environ.get("LLM_STREAM", "false").lower() in ("1", "true", "yes"),
     )
@@ -1,14 +1,177 @@
 #!/usr/bin/env python3
 """Database manager for JustJoinIT 3-phase pipeline"""
 
+import csv
+import io
+import json
+import threading
+
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
 from contextlib import contextmanager
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterable, Iterator, List, Any, Tuple
+
+from llm.scores import SCORE_FIELDS
+
+
+# Hot per-offer statements, PREPAREd once per pooled connection (server keeps the plan)
+_PREPARED_STATEMENTS = (
+    # New link → id from the INSERT; existing link → id from the SELECT (one round-trip either way)
+    """
+    PREPARE insert_link(text) AS
+        WITH ins AS (
+            INSERT INTO job_links (link, status)
+            VALUES ($1, 'discovered')
+            ON CONFLICT (link) DO NOTHING
+            RETURNING id
+        )
+        SELECT id FROM ins
+        UNION ALL
+        SELECT id FROM job_links WHERE link = $1
+        LIMIT 1
+    """,
+    # LIMIT NULL means no limit, so one plan serves limited and unlimited callers
+    """
+    PREPARE links_by_status(text, bigint) AS
+        SELECT * FROM job_links WHERE status = $1 ORDER BY discovered_at DESC LIMIT $2
+    """,
+    "PREPARE update_link_status(text, integer) AS UPDATE job_links SET status = $1 WHERE id = $2",
+    "PREPARE get_details(integer) AS SELECT * FROM job_details WHERE link_id = $1",
+    "PREPARE get_analysis(integer) AS SELECT * FROM job_analysis WHERE link_id = $1",
+)
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """Connection that remembers whether _PREPARED_STATEMENTS were already created on it"""
+    prepared = False
+
+
+def _prepare_statements(conn: _PooledConnection) -> None:
+    cur = conn.cursor()
+    for statement in _PREPARED_STATEMENTS:
+        cur.execute(statement)
+    conn.commit()
+    conn.prepared = True
+
+
+# Rows from the INSERT are invisible to the second SELECT (same snapshot), so no duplicates
+_INSERT_LINKS = """
+    WITH data (link) AS (VALUES %s),
+    ins AS (
+        INSERT INTO job_links (link, status)
+        SELECT link, 'discovered' FROM data
+        ON CONFLICT (link) DO NOTHING
+        RETURNING link, id
+    )
+    SELECT link, id FROM ins
+    UNION ALL
+    SELECT l.link, l.id FROM job_links l JOIN data d ON d.link = l.link
+"""
+
+_DETAILS_UPSERT = """
+    INSERT INTO job_details (
+        link_id, title, company, location,
+        remote_type, contract_type, exp_level, employment_type,
+        salary_min, salary_max, salary_currency, salary_rate, salary_type,
+        description, tech_stack, llm_content
+    ) VALUES %s
+    ON CONFLICT (link_id) DO UPDATE
+    SET title = EXCLUDED.title,
+        company = EXCLUDED.company,
+        location = EXCLUDED.location,
+        remote_type = EXCLUDED.remote_type,
+        contract_type = EXCLUDED.contract_type,
+        exp_level = EXCLUDED.exp_level,
+        employment_type = EXCLUDED.employment_type,
+        salary_min = EXCLUDED.salary_min,
+        salary_max = EXCLUDED.salary_max,
+        salary_currency = EXCLUDED.salary_currency,
+        salary_rate = EXCLUDED.salary_rate,
+        salary_type = EXCLUDED.salary_type,
+        description = EXCLUDED.description,
+        tech_stack = EXCLUDED.tech_stack,
+        llm_content = EXCLUDED.llm_content,
+        fetched_at = NOW()
+"""
+
+# Everything except the decision lives in scores_jsonb; schema.sql derives the
+# per-score columns from it (GENERATED ... STORED), so writes bind 3 params per row
+_ANALYSIS_COLUMNS = "link_id, decision, scores_jsonb"
+
+_ANALYSIS_ON_CONFLICT = """
+    ON CONFLICT (link_id) DO UPDATE
+    SET decision = EXCLUDED.decision,
+        scores_jsonb = EXCLUDED.scores_jsonb,
+        analyzed_at = NOW()
+"""
+
+# LLM result keys stored in scores_jsonb
+_ANALYSIS_JSON_KEYS = ('language', 'short_summary', 'fit_reasoning') + SCORE_FIELDS
+
+_ANALYSIS_UPSERT = f"INSERT INTO job_analysis ({_ANALYSIS_COLUMNS}) VALUES %s {_ANALYSIS_ON_CONFLICT}"
+
+# COPY path for large batches: stream CSV into a temp table, then one INSERT ... SELECT
+# Only the written columns: LIKE job_analysis would copy id's NOT NULL without its serial default
+_ANALYSIS_TMP_CREATE = (
+    "CREATE TEMP TABLE tmp_analysis (link_id INTEGER, decision TEXT, scores_jsonb JSONB) ON COMMIT DROP"
+)
+_ANALYSIS_TMP_COPY = f"COPY tmp_analysis ({_ANALYSIS_COLUMNS}) FROM STDIN WITH CSV"
+_ANALYSIS_TMP_UPSERT = (
+    f"INSERT INTO job_analysis ({_ANALYSIS_COLUMNS}) "
+    f"SELECT {_ANALYSIS_COLUMNS} FROM tmp_analysis {_ANALYSIS_ON_CONFLICT}"
+)
+
+
+_ALLOWED_DECISIONS = frozenset({'APPLY', 'WATCH', 'IGNORE'})
+
+
+def _details_row(link_id: int, details: Dict[str, Any]) -> tuple:
+    return (
+        link_id,
+        details.get('title'),
+        details.get('company'),
+        details.get('location'),
+        details.get('remote_type'),
+        details.get('contract_type'),
+        details.get('exp_level'),
+        details.get('employment_type'),
+        details.get('salary_min'),
+        details.get('salary_max'),
+        details.get('salary_currency'),
+        details.get('salary_rate'),
+        details.get('salary_type'),
+        details.get('description'),
+        psycopg2.extras.Json(details.get('tech_stack', [])),
+        details.get('llm_content'),
+    )
+
+
+def _analysis_payload(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: analysis.get(key) for key in _ANALYSIS_JSON_KEYS}
+
+
+def _analysis_row(link_id: int, analysis: Dict[str, Any]) -> tuple:
+    return (link_id, analysis.get('decision'), psycopg2.extras.Json(_analysis_payload(analysis)))
+
+
+def validate_analysis(analysis: Dict[str, Any]) -> None:
+    """Raise ValueError if an LLM analysis is missing fit_score or has an invalid decision.
+
+    Score ranges are not re-checked here: UnifiedScorer clamps every score to 0-100.
+    """
+    # Validate critical fields (fit_score and decision are REQUIRED)
+    if analysis.get('fit_score') is None:
+        raise ValueError(f"Missing fit_score in LLM response: {analysis}")
+    decision = analysis.get('decision')
+    if decision not in _ALLOWED_DECISIONS:
+        raise ValueError(f"Invalid or missing decision in LLM response: {decision}")
 
 
 class DBManager:
-    def __init__(self, dbname='justjoinit', user='postgres', password='postgres', host='localhost', port=5432):
+    def __init__(self, dbname='justjoinit', user='postgres', password='postgres', host='localhost', port=5432,
+                 minconn: int = 1, maxconn: int = 4):
         self.conn_params = {
             'dbname': dbname,
             'user': user,
@@ -16,19 +179,62 @@ class DBManager:
             'host': host,
             'port': port
         }
+        self.minconn = minconn
+        self.maxconn = max(minconn, maxconn)
+        # Pool is created on first use, so constructing a DBManager never touches the network
+        self._pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self) -> psycopg2.pool.ThreadedConnectionPool:
+        """Shared connection pool (created lazily, safe to use from worker threads)"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = psycopg2.pool.ThreadedConnectionPool(
+                        self.minconn, self.maxconn, connection_factory=_PooledConnection, **self.conn_params
+                    )
+        return self._pool
 
     @contextmanager
     def get_conn(self):
-        """Context manager for DB connection"""
-        conn = psycopg2.connect(**self.conn_params)
+        """Context manager for a pooled DB connection (commit on success, rollback on error)"""
+        pool = self.pool
+        conn = pool.getconn()
         try:
+            if not conn.prepared:
+                _prepare_statements(conn)
             yield conn
             conn.commit()
-        except Exception as e:
+        except Exception:
             conn.rollback()
-            raise e
+            raise
         finally:
-            conn.close()
+            pool.putconn(conn)
+
+    def _iter_rows(self, query: str, params: tuple, itersize: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Yield rows from a named (server-side) cursor, fetching `itersize` rows per round-trip.
+
+        The pooled connection stays checked out until the generator is exhausted or closed.
+        """
+        with self.get_conn() as conn:
+            cur = conn.cursor(name="dbmanager_iter", cursor_factory=psycopg2.extras.RealDictCursor)
+            cur.itersize = itersize
+            cur.execute(query, params)
+            yield from cur
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+    def __enter__(self) -> "DBManager":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
     # ========================================
     # PHASE 1: Link Discovery
@@ -38,35 +244,78 @@ class DBManager:
         """Insert discovered job link, return link_id. Skip if exists."""
         with self.get_conn() as conn:
             cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO job_links (link, status)
-                VALUES (%s, 'discovered')
-                ON CONFLICT (link) DO NOTHING
-                RETURNING id
-            """, (link,))
+            cur.execute("EXECUTE insert_link(%s)", (link,))
             row = cur.fetchone()
-            if row:
-                return row[0]
+            if row is None:
+                # Inserted by a concurrent transaction after our snapshot: the CTE's SELECT
+                # can't see it, a new statement (fresh READ COMMITTED snapshot) can
+                cur.execute("SELECT id FROM job_links WHERE link = %s", (link,))
+                row = cur.fetchone()
+            return row[0]
 
-            # Link already exists, fetch its id
-            cur.execute("SELECT id FROM job_links WHERE link = %s", (link,))
-            return cur.fetchone()[0]
+    def insert_links(self, links: List[str], page_size: int = 1000) -> Dict[str, int]:
+        """Insert many links (skipping existing ones), return {link: link_id} for all of them"""
+        unique_links = list(dict.fromkeys(links))
+        if not unique_links:
+            return {}
+        with self.get_conn() as conn:
+            cur = conn.cursor()
+            rows = psycopg2.extras.execute_values(
+                cur, _INSERT_LINKS, [(link,) for link in unique_links],
+                page_size=page_size, fetch=True,
+            )
+            return dict(rows)
+
+    def insert_links_bulk(self, links: Iterable[str], page_size: int = 1000) -> int:
+        """Insert many links in one transaction (existing ones skipped), return how many were new"""
+        rows = [(link,) for link in dict.fromkeys(links)]
+        if not rows:
+            return 0
+        inserted = 0
+        with self.get_conn() as conn:
+            cur = conn.cursor()
+            # One statement per page, so rowcount (rows actually inserted) covers the whole page
+            for start in range(0, len(rows), page_size):
+                psycopg2.extras.execute_values(
+                    cur, "INSERT INTO job_links (link) VALUES %s ON CONFLICT (link) DO NOTHING",
+                    rows[start:start + page_size], page_size=page_size,
+                )
+                inserted += cur.rowcount
+        return inserted
 
     def get_links_by_status(self, status: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get job links with given status"""
         with self.get_conn() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            query = "SELECT * FROM job_links WHERE status = %s ORDER BY discovered_at DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            cur.execute(query, (status,))
-            return [dict(row) for row in cur.fetchall()]
+            cur.execute("EXECUTE links_by_status(%s, %s)", (status, limit or None))
+            return cur.fetchall()
 
     def update_link_status(self, link_id: int, status: str) -> None:
         """Update link status (discovered → fetched → analyzed)"""
         with self.get_conn() as conn:
             cur = conn.cursor()
-            cur.execute("UPDATE job_links SET status = %s WHERE id = %s", (status, link_id))
+            cur.execute("EXECUTE update_link_status(%s, %s)", (status, link_id))
+
+    def update_links_status(self, link_ids: List[int], status: str) -> None:
+        """Update status of many links in one statement"""
+        if not link_ids:
+            return
+        with self.get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute("UPDATE job_links SET status = %s WHERE id = ANY(%s)", (status, list(link_ids)))
+
+    def update_link_status_bulk(self, rows: List[Tuple[int, str]], page_size: int = 1000) -> None:
+        """Set per-link statuses from (link_id, status) pairs in one transaction"""
+        if not rows:
+            return
+        with self.get_conn() as conn:
+            cur = conn.cursor()
+            psycopg2.extras.execute_values(
+                cur,
+                "UPDATE job_links SET status = data.status FROM (VALUES %s) AS data(id, status) "
+                "WHERE job_links.id = data.id",
+                rows, page_size=page_size,
+            )
 
     # ========================================
     # PHASE 2: Detail Fetching
@@ -74,56 +323,36 @@ class DBManager:
 
     def save_details(self, link_id: int, details: Dict[str, Any]) -> None:
         """Save fetched job details"""
+        self.save_details_bulk([(link_id, details)])
+
+    def save_details_bulk(self, rows: List[Tuple[int, Dict[str, Any]]], page_size: int = 100) -> None:
+        """Save many (link_id, details) pairs in one transaction using multi-row INSERTs"""
+        if not rows:
+            return
+        # ON CONFLICT DO UPDATE can't touch the same row twice in one statement - keep the latest
+        latest = dict(rows)
         with self.get_conn() as conn:
             cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO job_details (
-                    link_id, title, company, location,
-                    remote_type, contract_type, exp_level, employment_type,
-                    salary_min, salary_max, salary_currency, salary_rate, salary_type,
-                    description, tech_stack
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (link_id) DO UPDATE
-                SET title = EXCLUDED.title,
-                    company = EXCLUDED.company,
-                    location = EXCLUDED.location,
-                    remote_type = EXCLUDED.remote_type,
-                    contract_type = EXCLUDED.contract_type,
-                    exp_level = EXCLUDED.exp_level,
-                    employment_type = EXCLUDED.employment_type,
-                    salary_min = EXCLUDED.salary_min,
-                    salary_max = EXCLUDED.salary_max,
-                    salary_currency = EXCLUDED.salary_currency,
-                    salary_rate = EXCLUDED.salary_rate,
-                    salary_type = EXCLUDED.salary_type,
-                    description = EXCLUDED.description,
-                    tech_stack = EXCLUDED.tech_stack,
-                    fetched_at = NOW()
-            """, (
-                link_id,
-                details.get('title'),
-                details.get('company'),
-                details.get('location'),
-                details.get('remote_type'),
-                details.get('contract_type'),
-                details.get('exp_level'),
-                details.get('employment_type'),
-                details.get('salary_min'),
-                details.get('salary_max'),
-                details.get('salary_currency'),
-                details.get('salary_rate'),
-                details.get('salary_type'),
-                details.get('description'),
-                psycopg2.extras.Json(details.get('tech_stack', []))
-            ))
+            psycopg2.extras.execute_values(
+                cur, _DETAILS_UPSERT, [_details_row(link_id, details) for link_id, details in latest.items()],
+                page_size=page_size,
+            )
 
     def get_details_by_link_id(self, link_id: int) -> Optional[Dict[str, Any]]:
         """Get job details for a link_id"""
         with self.get_conn() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            cur.execute("SELECT * FROM job_details WHERE link_id = %s", (link_id,))
-            row = cur.fetchone()
-            return dict(row) if row else None
+            cur.execute("EXECUTE get_details(%s)", (link_id,))
+            return cur.fetchone()
+
+    def get_details_by_link_ids(self, link_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get job details for many link_ids in one query → {link_id: details}"""
+        if not link_ids:
+            return {}
+        with self.get_conn() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            cur.execute("SELECT * FROM job_details WHERE link_id = ANY(%s)", (list(link_ids),))
+            return {row["link_id"]: row for row in cur.fetchall()}
 
     # ========================================
     # PHASE 3: LLM Analysis
@@ -136,83 +365,53 @@ class DBManager:
         or missing fields, this will raise ValueError - preventing status update
         so the offer can be retried on next run.
         """
-        # Validate critical fields (fit_score and decision are REQUIRED)
-        fit_score = analysis.get('fit_score')
-        decision = analysis.get('decision')
-
-        if fit_score is None:
-            raise ValueError(f"Missing fit_score in LLM response: {analysis}")
-        if decision is None or decision not in ['APPLY', 'WATCH', 'IGNORE']:
-            raise ValueError(f"Invalid or missing decision in LLM response: {decision}")
-
-        # Validate score ranges (0-100)
-        scores = {
-            'fit_score': fit_score,
-            'cringe_score': analysis.get('cringe_score'),
-            'januszex_score': analysis.get('januszex_score'),
-            'work_culture_score': analysis.get('work_culture_score'),
-            'stability_score': analysis.get('stability_score'),
-            'benefit_score': analysis.get('benefit_score'),
-            'lgbt_score': analysis.get('lgbt_score'),
-            'corpo_score': analysis.get('corpo_score'),
-        }
+        validate_analysis(analysis)
+        self.save_analysis_bulk([(link_id, analysis)])
 
-        for score_name, score_value in scores.items():
-            if score_value is not None:
-                try:
-                    score_int = int(score_value)
-                    if not (0 <= score_int <= 100):
-                        raise ValueError(f"{score_name} out of range: {score_int}")
-                except (TypeError, ValueError) as e:
-                    raise ValueError(f"Invalid {score_name}: {score_value}") from e
+    def save_analysis_bulk(self, rows: List[Tuple[int, Dict[str, Any]]], page_size: int = 100) -> None:
+        """Save many (link_id, analysis) pairs in one transaction using multi-row INSERTs
 
+        Rows are NOT validated here - run validate_analysis() on each one first,
+        so a single bad LLM response can't make the whole batch fail.
+        """
+        if not rows:
+            return
+        # ON CONFLICT DO UPDATE can't touch the same row twice in one statement - keep the latest
+        latest = dict(rows)
         with self.get_conn() as conn:
             cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO job_analysis (
-                    link_id, language, short_summary,
-                    cringe_score, januszex_score,
-                    work_culture_score, stability_score,
-                    benefit_score, lgbt_score, corpo_score,
-                    fit_score, fit_reasoning, decision
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (link_id) DO UPDATE
-                SET language = EXCLUDED.language,
-                    short_summary = EXCLUDED.short_summary,
-                    cringe_score = EXCLUDED.cringe_score,
-                    januszex_score = EXCLUDED.januszex_score,
-                    work_culture_score = EXCLUDED.work_culture_score,
-                    stability_score = EXCLUDED.stability_score,
-                    benefit_score = EXCLUDED.benefit_score,
-                    lgbt_score = EXCLUDED.lgbt_score,
-                    corpo_score = EXCLUDED.corpo_score,
-                    fit_score = EXCLUDED.fit_score,
-                    fit_reasoning = EXCLUDED.fit_reasoning,
-                    decision = EXCLUDED.decision,
-                    analyzed_at = NOW()
-            """, (
-                link_id,
-                analysis.get('language'),
-                analysis.get('short_summary'),
-                analysis.get('cringe_score'),
-                analysis.get('januszex_score'),
-                analysis.get('work_culture_score'),
-                analysis.get('stability_score'),
-                analysis.get('benefit_score'),
-                analysis.get('lgbt_score'),
-                analysis.get('corpo_score'),
-                analysis.get('fit_score'),
-                analysis.get('fit_reasoning'),
-                analysis.get('decision')
-            ))
+            psycopg2.extras.execute_values(
+                cur, _ANALYSIS_UPSERT, [_analysis_row(link_id, analysis) for link_id, analysis in latest.items()],
+                page_size=page_size,
+            )
+
+    def bulk_upsert_analysis(self, rows: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Save many (link_id, analysis) pairs via COPY into a temp table + one upsert
+
+        Faster than save_analysis_bulk for large rescoring batches (hundreds of rows
+        and up). Rows are NOT validated here either.
+        """
+        if not rows:
+            return
+        latest = dict(rows)
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC)
+        for link_id, analysis in latest.items():
+            # Unquoted empty fields (None) load as NULL
+            writer.writerow((link_id, analysis.get('decision'), json.dumps(_analysis_payload(analysis))))
+        buf.seek(0)
+        with self.get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(_ANALYSIS_TMP_CREATE)
+            cur.copy_expert(_ANALYSIS_TMP_COPY, buf)
+            cur.execute(_ANALYSIS_TMP_UPSERT)
 
     def get_analysis_by_link_id(self, link_id: int) -> Optional[Dict[str, Any]]:
         """Get LLM analysis for a link_id"""
         with self.get_conn() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            cur.execute("SELECT * FROM job_analysis WHERE link_id = %s", (link_id,))
-            row = cur.fetchone()
-            return dict(row) if row else None
+            cur.execute("EXECUTE get_analysis(%s)", (link_id,))
+            return cur.fetchone()
 
     # ========================================
     # QUERIES: Combined views
@@ -223,7 +422,11 @@ class DBManager:
         with self.get_conn() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
             cur.execute("SELECT * FROM v_top_matches LIMIT %s", (limit,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
+
+    def iter_top_matches(self, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream APPLY offers ordered by fit_score (server-side cursor)"""
+        return self._iter_rows("SELECT * FROM v_top_matches LIMIT %s", (limit or None,))
 
     def get_stats(self) -> Dict[str, int]:
         """Get pipeline statistics"""
@@ -237,5 +440,4 @@ class DBManager:
         with self.get_conn() as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
             cur.execute("SELECT * FROM v_offers WHERE link = %s", (link,))
-            row = cur.fetchone()
-            return dict(row) if row else None
+            return cur.fetchone()
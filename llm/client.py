@@ -3,10 +3,22 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from typing import Any, Dict
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works the same
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 
 class LLMError(RuntimeError):
@@ -19,8 +31,72 @@ class LLMClient:
     model: str
     timeout: int = 60
     api_key: str = None  # Optional API key for hosted services (Grok, OpenAI, etc.)
+    pool_maxsize: int = 16  # Keep-alive connections kept per host (should cover --workers)
+    async_max_connections: int = 64  # In-flight requests allowed on the async client
+    supports_json_mode: bool = True  # Ask for response_format=json_object (raw JSON, no fences)
+    stream: bool = False  # Async calls read the answer as SSE chunks (timeout workaround, not faster)
 
-    def _request(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    _session: Optional[requests.Session] = field(default=None, init=False, repr=False, compare=False)
+    _session_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _async_client: Optional[httpx.AsyncClient] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_config(cls, config: Config) -> "LLMClient":
+        return cls(
+            config.llm_base_url,
+            config.llm_model,
+            config.llm_timeout,
+            config.llm_api_key,
+            supports_json_mode=config.llm_json_mode,
+            stream=config.llm_stream,
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive HTTP session, created on first use and shared by all threads."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    if self.api_key:
+                        session.headers["Authorization"] = f"Bearer {self.api_key}"
+                    self._session = session
+        return self._session
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Async HTTP client bound to the running event loop (created on first use)."""
+        if self._async_client is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=headers,
+                limits=httpx.Limits(max_connections=self.async_max_connections),
+            )
+        return self._async_client
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    async def aclose(self) -> None:
+        """Close the async client; call before the event loop that created it shuts down."""
+        if self._async_client is not None:
+            client, self._async_client = self._async_client, None
+            await client.aclose()
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _payload(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         payload = {
             "model": self.model,
             "messages": [
@@ -30,25 +106,73 @@ class LLMClient:
             "temperature": 0.05,  # Very low for stable JSON
             "max_tokens": 4096,
         }
+        if self.supports_json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
 
-        headers = {}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-
-        response = requests.post(
+    def _request(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        response = self.session.post(
             f"{self.base_url}/chat/completions",
-            json=payload,
-            headers=headers,
+            json=self._payload(system_prompt, user_prompt),
             timeout=self.timeout,
         )
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
+
+    async def _request_async(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        if self.stream:
+            return await self._request_async_stream(system_prompt, user_prompt)
+        response = await self.async_client.post(
+            f"{self.base_url}/chat/completions",
+            json=self._payload(system_prompt, user_prompt),
+        )
+        response.raise_for_status()
+        return _json_loads(response.content)
+
+    async def _request_async_stream(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Streamed (SSE) _request_async: content deltas are joined back into the usual response shape.
+
+        No latency win: the JSON is only parsed once the stream ends, so results arrive no
+        earlier than with a buffered request (plus SSE framing overhead). The one gain is
+        that the read timeout applies per chunk, so very long generations don't hit
+        LLM_TIMEOUT while the server is still producing tokens. Off by default.
+        """
+        payload = self._payload(system_prompt, user_prompt)
+        payload["stream"] = True
+        parts = []
+        async with self.async_client.stream(
+            "POST", f"{self.base_url}/chat/completions", json=payload
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = _json_loads(data).get("choices")
+                if choices:
+                    parts.append((choices[0].get("delta") or {}).get("content") or "")
+        return {"choices": [{"message": {"content": "".join(parts)}}]}
 
     def complete_json(self, *, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """Call the LLM and parse the JSON payload from the response."""
-        data = self._request(system_prompt, user_prompt)
+        return self._parse_json(self._request(system_prompt, user_prompt))
+
+    async def complete_json_async(self, *, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Async variant of complete_json (does not block the event loop)."""
+        return self._parse_json(await self._request_async(system_prompt, user_prompt))
+
+    @staticmethod
+    def _parse_json(data: Dict[str, Any]) -> Dict[str, Any]:
         content = data["choices"][0]["message"]["content"].strip()
 
+        # JSON mode returns a bare object; only scrub fences when that didn't parse
+        try:
+            return _json_loads(content)
+        except json.JSONDecodeError:
+            pass
+
         if "```" in content:
             # Handle both ```json and ``` fences.
             blocks = content.split("```")
@@ -65,16 +189,13 @@ class LLMClient:
             else:
                 raise LLMError("LLM response did not include JSON block")
         try:
-            return json.loads(content)
+            return _json_loads(content)
         except json.JSONDecodeError as exc:
             raise LLMError(f"Invalid JSON from LLM: {exc}") from exc
 
     def health(self) -> bool:
         try:
-            headers = {}
-            if self.api_key:
-                headers["Authorization"] = f"Bearer {self.api_key}"
-            response = requests.get(f"{self.base_url}/models", timeout=5, headers=headers)
+            response = self.session.get(f"{self.base_url}/models", timeout=5)
             return response.status_code == 200
         except requests.RequestException:
             return False
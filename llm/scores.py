@@ -0,0 +1,38 @@
+"""Score fields shared by the LLM scorer and the database layer."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+# job_analysis score columns (all 0-100)
+SCORE_FIELDS = (
+    "cringe_score",
+    "januszex_score",
+    "work_culture_score",
+    "stability_score",
+    "benefit_score",
+    "lgbt_score",
+    "corpo_score",
+    "fit_score",
+)
+
+DEFAULT_SCORE = 50
+
+
+def clamp_score(value: Any, default: int = DEFAULT_SCORE) -> float:
+    """Coerce an LLM score to float in 0-100 (default when missing or not a number)."""
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return float(default)
+    if score != score:  # NaN
+        return float(default)
+    return max(0.0, min(100.0, score))
+
+
+def clamp_scores(result: Dict[str, Any]) -> Dict[str, float]:
+    """Clamp every score field of a raw LLM result in one pass."""
+    return {name: clamp_score(result.get(name)) for name in SCORE_FIELDS}
+
+
+__all__ = ["SCORE_FIELDS", "DEFAULT_SCORE", "clamp_score", "clamp_scores"]
@@ -2,75 +2,167 @@
 
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from config import LLM_BASE_URL, LLM_MODEL, LLM_TIMEOUT, LLM_API_KEY
+from config import get_config
 from llm.client import LLMClient
+from llm.scores import clamp_scores
 
 
+SYSTEM_PROMPT_PATH = Path(__file__).parent.parent / "system_prompt.md"
+
+
+@lru_cache(maxsize=1)
 def load_system_prompt() -> str:
-    """Load system prompt from markdown file."""
-    prompt_path = Path(__file__).parent.parent / "system_prompt.md"
-    with open(prompt_path, "r", encoding="utf-8") as f:
+    """Load system prompt from markdown file (read once per process)."""
+    with open(SYSTEM_PROMPT_PATH, "r", encoding="utf-8") as f:
         return f.read()
 
 
-@dataclass
-class UnifiedScorer:
-    """Unified 1-stage scorer - system prompt from markdown."""
+@lru_cache(maxsize=1)
+def system_prompt_sha256() -> str:
+    """Hex digest of the system prompt - use it in cache keys derived from scoring results."""
+    return hashlib.sha256(load_system_prompt().encode("utf-8")).hexdigest()
 
-    client: LLMClient = field(default_factory=lambda: LLMClient(LLM_BASE_URL, LLM_MODEL, LLM_TIMEOUT, LLM_API_KEY))
-    system_prompt: str = field(default_factory=load_system_prompt)
 
-    def score_offer(
-        self,
-        *,
-        content: str,
-        metadata: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        """Score offer - 1 LLM call."""
-        # Support both remote_mode (parser) and remote_type (database)
-        remote = metadata.get('remote_type') or metadata.get('remote_mode', '?')
+# Offer text sent to the LLM is capped at this many characters
+MAX_CONTENT_CHARS = 3000
 
-        # Build salary info with rate and type if available
-        salary_info = f"{metadata.get('salary_min', '?')}-{metadata.get('salary_max', '?')} {metadata.get('salary_currency', '')}"
-        if metadata.get('salary_rate'):
-            salary_info += f"/{metadata.get('salary_rate')}"
-        if metadata.get('salary_type'):
-            salary_info += f" ({metadata.get('salary_type')})"
+# Scored prompts kept per scorer - reposted offers with identical text skip the LLM call
+RESULT_CACHE_SIZE = 1024
 
-        user_prompt = f"""OFERTA DO ANALIZY:
+_PROMPT_TEMPLATE = """OFERTA DO ANALIZY:
 
-Firma: {metadata.get('company', '?')}
-Stanowisko: {metadata.get('title', '?')}
-Lokalizacja: {metadata.get('location', '?')}
+Firma: {company}
+Stanowisko: {title}
+Lokalizacja: {location}
 Tryb: {remote}
-Umowa: {metadata.get('contract_type', '?')}
-Exp level: {metadata.get('exp_level', '?')}
-Typ zatrudnienia: {metadata.get('employment_type', '?')}
+Umowa: {contract_type}
+Exp level: {exp_level}
+Typ zatrudnienia: {employment_type}
 Kasa: {salary_info}
 
 TREŚĆ:
-{content[:3000]}
+{content}
 
 Zwróć JSON.
 """
 
+
+def _prompt_key(user_prompt: str) -> bytes:
+    return hashlib.blake2b(user_prompt.encode("utf-8"), digest_size=16).digest()
+
+
+class _SafeDict(dict):
+    """format_map() mapping that renders missing metadata keys as '?'."""
+
+    def __missing__(self, key: str) -> str:
+        return "?"
+
+
+def _build_salary(metadata: Dict[str, Any]) -> str:
+    """Salary line for the prompt, e.g. '20000-25000 PLN/monthly (gross)'."""
+    salary_min = metadata.get('salary_min', '?')
+    salary_max = metadata.get('salary_max', '?')
+    if salary_min is None and salary_max is None:
+        return "?"
+
+    # Build salary info with rate and type if available
+    salary_info = f"{salary_min}-{salary_max} {metadata.get('salary_currency', '')}"
+    salary_rate = metadata.get('salary_rate')
+    if salary_rate:
+        salary_info += f"/{salary_rate}"
+    salary_type = metadata.get('salary_type')
+    if salary_type:
+        salary_info += f" ({salary_type})"
+    return salary_info
+
+
+@dataclass
+class UnifiedScorer:
+    """Unified 1-stage scorer - system prompt from markdown."""
+
+    client: LLMClient = field(default_factory=lambda: LLMClient.from_config(get_config()))
+    system_prompt: str = field(default_factory=load_system_prompt)
+
+    # blake2b(user prompt) -> normalized result; the system prompt is fixed per scorer
+    _results: "OrderedDict[bytes, Dict[str, Any]]" = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+    _results_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def score_offer(
+        self,
+        *,
+        content: str,
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Score offer - 1 LLM call (none if the same prompt was scored before)."""
+        user_prompt = self._build_user_prompt(content, metadata)
+        key = _prompt_key(user_prompt)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
         result = self.client.complete_json(
             system_prompt=self.system_prompt,
             user_prompt=user_prompt,
         )
+        return self._remember(key, self._normalize_result(result))
+
+    async def score_offer_async(
+        self,
+        *,
+        content: str,
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Score offer - 1 LLM call on the async client (for event-loop callers)."""
+        user_prompt = self._build_user_prompt(content, metadata)
+        key = _prompt_key(user_prompt)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        result = await self.client.complete_json_async(
+            system_prompt=self.system_prompt,
+            user_prompt=user_prompt,
+        )
+        return self._remember(key, self._normalize_result(result))
+
+    def _cached_result(self, key: bytes) -> Optional[Dict[str, Any]]:
+        with self._results_lock:
+            result = self._results.get(key)
+            if result is None:
+                return None
+            self._results.move_to_end(key)
+        # Copy: callers may add to / edit the result they get back
+        return dict(result)
+
+    def _remember(self, key: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+        with self._results_lock:
+            self._results[key] = dict(result)
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _build_user_prompt(content: str, metadata: Dict[str, Any]) -> str:
+        # Support both remote_mode (parser) and remote_type (database)
+        remote = metadata.get('remote_type') or metadata.get('remote_mode', '?')
 
-        # Helper: clamp scores to 0-100
-        def clamp_score(value: Any, default: int = 50) -> float:
-            try:
-                score = float(value)
-                return max(0.0, min(100.0, score))
-            except (TypeError, ValueError):
-                return float(default)
+        return _PROMPT_TEMPLATE.format_map(_SafeDict(
+            metadata,
+            remote=remote,
+            salary_info=_build_salary(metadata),
+            content=content[:MAX_CONTENT_CHARS],
+        ))
 
+    @staticmethod
+    def _normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
         # Validate decision
         decision = result.get("decision", "WATCH").upper()
         if decision not in ["APPLY", "WATCH", "IGNORE"]:
@@ -79,14 +171,7 @@ Zwróć JSON.
         return {
             "language": result.get("language", "unknown"),
             "short_summary": result.get("short_summary", "")[:500],
-            "cringe_score": clamp_score(result.get("cringe_score"), 50),
-            "januszex_score": clamp_score(result.get("januszex_score"), 50),
-            "work_culture_score": clamp_score(result.get("work_culture_score"), 50),
-            "stability_score": clamp_score(result.get("stability_score"), 50),
-            "benefit_score": clamp_score(result.get("benefit_score"), 50),
-            "lgbt_score": clamp_score(result.get("lgbt_score"), 50),
-            "corpo_score": clamp_score(result.get("corpo_score"), 50),
-            "fit_score": clamp_score(result.get("fit_score"), 50),
+            **clamp_scores(result),
             "fit_reasoning": result.get("fit_reasoning", "")[:1000],
             "decision": decision,
         }
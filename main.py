@@ -2,21 +2,23 @@
 """
 3-Phase Pipeline Runner:
   Phase 1: Discovery  (load links from offers.json)
-  Phase 2: Fetching   (curl each offer page)
+  Phase 2: Fetching   (fetch each offer page over HTTP)
   Phase 3: Analysis   (LLM scoring)
 
 Usage:
-  python main.py [limit] [--workers N]
+  python main.py [limit] [offers_path] [--workers N]
+  python main.py [--limit N] [--offers PATH] [--workers N]
 
 Examples:
-  python main.py 10              # Process 10 offers, 1 worker
-  python main.py 100 --workers 4 # Process 100 offers, 4 parallel workers
-  python main.py --workers 10    # Process all offers, 10 parallel workers
+  python main.py 10                   # Process 10 offers, 1 worker
+  python main.py 100 --workers 4      # Process 100 offers, 4 parallel workers
+  python main.py --workers 10         # Process all offers, 10 parallel workers
+  python main.py custom_offers.json   # Load another offers file, process all
 """
 
 from __future__ import annotations
 
-import sys
+import argparse
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -24,47 +26,48 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+from db.manager import DBManager
 from pipeline.processor import OfferPipeline
 
 PACKAGE_ROOT = Path(__file__).resolve().parent
 DEFAULT_OFFERS_PATH = PACKAGE_ROOT / "data" / "offers.json"
 
 
+_PARSER = argparse.ArgumentParser(description="JustJoinIT AI Analyzer - 3-Phase Pipeline")
+# Positionals keep the old CLI: a number is the limit, anything else the offers path (any order)
+_PARSER.add_argument("positional", nargs="*", metavar="limit | offers_path",
+                     help="number of offers to process and/or offers JSON to load")
+_PARSER.add_argument("-n", "--limit", type=int, help="max number of offers to process (default: all)")
+_PARSER.add_argument("-o", "--offers", type=Path, dest="offers_path",
+                     help=f"offers JSON to load (default: {DEFAULT_OFFERS_PATH.relative_to(PACKAGE_ROOT)})")
+_PARSER.add_argument("-w", "--workers", type=int, default=1, help="parallel workers (default: 1)")
+
+
 def parse_args():
-    """Parse command line arguments"""
-    limit = None
-    workers = 1
-    offers_path = DEFAULT_OFFERS_PATH
-
-    args = sys.argv[1:]
-    i = 0
-    while i < len(args):
-        arg = args[i]
-        if arg == '--workers' or arg == '-w':
-            if i + 1 < len(args):
-                workers = int(args[i + 1])
-                i += 2
-            else:
-                print("Error: --workers requires a number")
-                sys.exit(1)
-        elif arg.startswith('--workers='):
-            workers = int(arg.split('=')[1])
-            i += 1
-        elif arg.isdigit():
+    """Parse command line arguments → (limit, workers, offers_path)"""
+    args = _PARSER.parse_args()
+    limit, offers_path = args.limit, args.offers_path
+    for arg in args.positional:
+        if arg.isdigit():
+            if limit is not None:
+                _PARSER.error(f"limit given twice: {arg}")
             limit = int(arg)
-            i += 1
         else:
+            if offers_path is not None:
+                _PARSER.error(f"offers path given twice: {arg}")
             offers_path = Path(arg)
-            i += 1
-
-    return limit, workers, offers_path
+    return limit, args.workers, offers_path or DEFAULT_OFFERS_PATH
 
 
 def main() -> None:
     limit, workers, offers_path = parse_args()
 
-    pipeline = OfferPipeline()
+    # Size the pool so every worker can hold a connection while another is checked out
+    with DBManager(maxconn=max(2, workers * 2)) as db, OfferPipeline(db=db) as pipeline:
+        run(pipeline, limit, workers, offers_path)
 
+
+def run(pipeline: OfferPipeline, limit, workers: int, offers_path: Path) -> None:
     print("=" * 60)
     print("🤖 JustJoinIT AI Analyzer - 3-Phase Pipeline")
     print("=" * 60)
@@ -72,19 +75,20 @@ def main() -> None:
 
     # Check LLM server
     if not pipeline.scorer.client.health():
-        print("⚠️  LLM server not reachable at http://localhost:1234/v1")
-        print("   Start lm-studio or adjust config in config.py")
+        print(f"⚠️  LLM server not reachable at {pipeline.scorer.client.base_url}")
+        print("   Check LLM_BASE_URL / LLM_API_KEY in your .env file")
         return
     else:
         print("✓ LLM server reachable")
 
     # Phase 1: Discovery
-    if offers_path.exists():
-        print(f"\n🔍 Phase 1: Discovery")
+    print("\n🔍 Phase 1: Discovery")
+    try:
         inserted = pipeline.load_offers_file(offers_path)
-        print(f"✓ Loaded {inserted} links from {offers_path.name}")
+    except FileNotFoundError:
+        print(f"⚠️  {offers_path} not found – skipping discovery")
     else:
-        print(f"\n⚠️  {offers_path} not found – skipping discovery")
+        print(f"✓ Loaded {inserted} links from {offers_path.name}")
 
     # Phase 2 & 3: Fetch + Analyze
     if workers == 1:
@@ -5,33 +5,102 @@ from __future__ import annotations
 
 import asyncio
 import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
-from db.manager import DBManager
-from llm.client import LLMError
-from pipeline.processor import OfferPipeline
-from parsing.offer_parser import (
-    extract_content_for_llm,
-    fetch_offer_html,
-    parse_offer_detail,
-)
+if TYPE_CHECKING:
+    from db.manager import DBManager
+    from pipeline.processor import OfferPipeline
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works the same
+    orjson = None
 
 server = Server("justjoinit")
-pipeline = OfferPipeline()
-db = pipeline.db
 PACKAGE_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_OFFERS_PATH = PACKAGE_ROOT / "data" / "offers.json"
+FETCH_CONCURRENCY = 8  # Offer pages fetched in parallel by fetch_job_offers
+
+
+# The pipeline pulls in psycopg2, the LLM client and the parser; build it on the
+# first tool call that needs it instead of on every server spawn.
+@lru_cache(maxsize=None)
+def get_pipeline() -> OfferPipeline:
+    from pipeline.processor import OfferPipeline
+
+    return OfferPipeline()
+
+
+def get_db() -> DBManager:
+    return get_pipeline().db
+
+
+# link -> job_details fields for _merge_metadata. Staging fills it with the details it
+# just saved (so the lookup right after never hits the DB); other links are loaded
+# from v_offers on first use. Misses (None) are not cached.
+OFFER_CACHE_SIZE = 2048
+_offer_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_offer_cache_lock = threading.Lock()
+
+
+def _get_offer(link: str) -> Optional[Dict[str, Any]]:
+    with _offer_cache_lock:
+        offer = _offer_cache.get(link)
+        if offer is not None:
+            _offer_cache.move_to_end(link)
+            return offer
+    offer = get_db().get_offer_with_scores(link)
+    if offer is not None:
+        with _offer_cache_lock:
+            _offer_cache[link] = offer
+            if len(_offer_cache) > OFFER_CACHE_SIZE:
+                _offer_cache.popitem(last=False)
+    return offer
+
+
+def _cache_offers(details_by_link: Dict[str, Dict[str, Any]]) -> None:
+    with _offer_cache_lock:
+        for link, details in details_by_link.items():
+            _offer_cache[link] = details
+            _offer_cache.move_to_end(link)
+        while len(_offer_cache) > OFFER_CACHE_SIZE:
+            _offer_cache.popitem(last=False)
+
+
+def _json_default(value: Any) -> Any:
+    # NUMERIC salary columns come back as Decimal, timestamps as datetime
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+    return json.dumps(payload, indent=2, ensure_ascii=False, default=_json_default)
+
 
 def _json_response(payload: Dict[str, Any]) -> List[TextContent]:
     return [
         TextContent(
             type="text",
-            text=json.dumps(payload, indent=2, ensure_ascii=False),
+            text=_dumps(payload),
         )
     ]
 
@@ -127,19 +196,27 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
 
 async def _analyze_job_offer(args: Dict[str, Any]) -> List[TextContent]:
     """Unified 1-stage analysis for 120B model: all-in-one comprehensive scoring."""
+    from llm.client import LLMError
+    from parsing.offer_parser import parse_offer
+
+    pipeline = get_pipeline()
+    db = pipeline.db
     link = args.get("link")
     content = args.get("content")
     metadata = args.get("metadata", {})
 
     if not content:
+        loop = asyncio.get_running_loop()
         html = await _ensure_html(link)
-        parsed = parse_offer_detail(html)
-        db.save_parsed_data(link, parsed)
-        content = extract_content_for_llm(parsed, html)
-        metadata = _merge_metadata(link, metadata)
+        parsed, content = await loop.run_in_executor(None, parse_offer, html)
+        # Same sanity checks as the pipeline: error pages / stubs are not analyzed
+        _, rejected = await loop.run_in_executor(None, _stage_parsed, [(link, parsed)])
+        if rejected:
+            return _json_response({"link": link, "status": "failed", "message": rejected[link]})
+        metadata = await loop.run_in_executor(None, _merge_metadata, link, metadata)
 
     try:
-        scores = pipeline.scorer.score_offer(
+        scores = await pipeline.scorer.score_offer_async(
             content=content,
             metadata=metadata,
         )
@@ -147,30 +224,85 @@ async def _analyze_job_offer(args: Dict[str, Any]) -> List[TextContent]:
         return _json_response({"error": str(exc)})
 
     if link:
-        db.save_scores(link, scores)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _save_analysis, db, link, scores)
 
     return _json_response(scores)
 
 
 async def _fetch_job_offers(args: Dict[str, Any]) -> List[TextContent]:
     links: List[str] = args.get("links") or []
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    outcomes = await asyncio.gather(*(_fetch_one(sem, link) for link in links))
+
+    staged = [(link, parsed) for link, parsed, _ in outcomes if parsed is not None]
+    rejected: Dict[str, str] = {}
+    # One bulk write for everything that parsed
+    if staged:
+        loop = asyncio.get_running_loop()
+        _, rejected = await loop.run_in_executor(None, _stage_parsed, staged)
+
     results: List[Dict[str, Any]] = []
-    for link in links:
+    for link, parsed, error in outcomes:
+        if parsed is None:
+            results.append({"link": link, "status": "error", "message": error})
+        elif link in rejected:
+            results.append({"link": link, "status": "failed", "message": rejected[link]})
+        else:
+            results.append({"link": link, "status": "parsed"})
+    return _json_response({"results": results})
+
+
+async def _fetch_one(sem: asyncio.Semaphore, link: str) -> tuple:
+    """Fetch + parse one link off the event loop. Returns (link, parsed or None, error message)."""
+    from parsing.offer_parser import fetch_offer_html, parse_offer_detail
+
+    loop = asyncio.get_running_loop()
+    async with sem:
         try:
-            html = fetch_offer_html(link)
+            html = await loop.run_in_executor(None, fetch_offer_html, link)
             if not html:
                 raise RuntimeError("Empty response")
-            parsed = parse_offer_detail(html)
-            db.save_parsed_data(link, parsed)
-            results.append({"link": link, "status": "parsed"})
+            parsed = await loop.run_in_executor(None, parse_offer_detail, html)
+            return link, parsed, None
         except Exception as exc:  # noqa: BLE001 - record failure
-            results.append({"link": link, "status": "error", "message": str(exc)})
-    return _json_response({"results": results})
+            return link, None, str(exc)
+
+
+def _stage_parsed(staged: List[tuple]) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """Validate (link, parsed) pairs and save the good ones as 'fetched' offers.
+
+    Rejected pages (error pages, stubs) are not saved; like in the pipeline their links
+    stay 'discovered'. Returns ({link: link_id} of saved offers, {link: rejection reason}).
+    """
+    from pipeline.processor import _validate_and_build_details
+
+    accepted: Dict[str, Dict[str, Any]] = {}
+    rejected: Dict[str, str] = {}
+    for link, parsed in staged:
+        try:
+            accepted[link] = _validate_and_build_details(parsed)
+        except ValueError as exc:
+            rejected[link] = str(exc)
+
+    db = get_db()
+    link_ids = db.insert_links([link for link, _ in staged])
+    saved = {link: link_ids[link] for link in accepted}
+    if saved:
+        db.save_details_bulk([(saved[link], details) for link, details in accepted.items()])
+        db.update_links_status(list(saved.values()), "fetched")
+        _cache_offers(accepted)
+    return saved, rejected
+
+
+def _save_analysis(db: DBManager, link: str, scores: Dict[str, Any]) -> None:
+    # Only job_details fields are cached, so a new analysis doesn't make an entry stale
+    db.save_analysis(db.insert_link(link), scores)
 
 
 async def _process_new_offers(args: Dict[str, Any]) -> List[TextContent]:
     limit = args.get("limit")
-    summary = pipeline.process_new_offers(limit=int(limit) if limit else None)
+    summary = get_pipeline().process_new_offers(limit=int(limit) if limit else None)
     return _json_response(summary)
 
 
@@ -178,26 +310,28 @@ async def _upload_offers_json(args: Dict[str, Any]) -> List[TextContent]:
     override = args.get("file_path")
     file_path = Path(override) if override else DEFAULT_OFFERS_PATH
     try:
-        inserted, updated = pipeline.load_offers_file(file_path)
+        inserted = get_pipeline().load_offers_file(file_path)
     except FileNotFoundError as exc:
         return _json_response({"error": str(exc)})
-    return _json_response({"inserted": inserted, "updated": updated, "file": str(file_path)})
+    return _json_response({"inserted": inserted, "file": str(file_path)})
 
 
 async def _get_top_matches(args: Dict[str, Any]) -> List[TextContent]:
     limit = args.get("limit")
-    rows = db.get_top_matches(limit=int(limit) if limit else 20)
+    rows = list(get_db().iter_top_matches(limit=int(limit) if limit else 20))
     return _json_response({"offers": rows})
 
 
 async def _get_stats(_: Dict[str, Any]) -> List[TextContent]:
-    return _json_response(db.get_stats())
+    return _json_response(get_db().get_stats())
+
 
+async def _ensure_html(link: Optional[str]) -> bytes:
+    from parsing.offer_parser import fetch_offer_html
 
-async def _ensure_html(link: Optional[str]) -> str:
     if not link:
         raise ValueError("link is required when content is absent")
-    html = fetch_offer_html(link)
+    html = await asyncio.get_running_loop().run_in_executor(None, fetch_offer_html, link)
     if not html:
         raise RuntimeError(f"Could not fetch HTML for {link}")
     return html
@@ -206,7 +340,7 @@ async def _ensure_html(link: Optional[str]) -> str:
 def _merge_metadata(link: Optional[str], metadata: Dict[str, Any]) -> Dict[str, Any]:
     if not link:
         return metadata
-    offer = db.get_offer_with_scores(link)
+    offer = _get_offer(link)
     if not offer:
         return metadata
     # Include all fields from job_details (except id, link_id, fetched_at)
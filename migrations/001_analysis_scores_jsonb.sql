@@ -0,0 +1,122 @@
+-- ============================================================================
+-- 001: job_analysis scores → single scores_jsonb column
+-- ============================================================================
+-- Writes now send (link_id, decision, scores_jsonb); the old scalar columns
+-- become generated columns derived from scores_jsonb.
+-- Fresh databases get this from schema.sql - run this only on existing ones:
+--   psql -U postgres -d justjoinit -f migrations/001_analysis_scores_jsonb.sql
+
+BEGIN;
+
+-- Views reference the columns being replaced
+DROP VIEW IF EXISTS v_top_matches;
+DROP VIEW IF EXISTS v_offers;
+
+ALTER TABLE job_analysis ADD COLUMN scores_jsonb JSONB NOT NULL DEFAULT '{}';
+
+UPDATE job_analysis SET scores_jsonb = jsonb_strip_nulls(jsonb_build_object(
+    'language', language,
+    'short_summary', short_summary,
+    'cringe_score', cringe_score,
+    'januszex_score', januszex_score,
+    'work_culture_score', work_culture_score,
+    'stability_score', stability_score,
+    'benefit_score', benefit_score,
+    'lgbt_score', lgbt_score,
+    'corpo_score', corpo_score,
+    'fit_score', fit_score,
+    'fit_reasoning', fit_reasoning
+));
+
+-- Drops idx_analysis_fit_score along with fit_score
+ALTER TABLE job_analysis
+    DROP COLUMN language,
+    DROP COLUMN short_summary,
+    DROP COLUMN cringe_score,
+    DROP COLUMN januszex_score,
+    DROP COLUMN work_culture_score,
+    DROP COLUMN stability_score,
+    DROP COLUMN benefit_score,
+    DROP COLUMN lgbt_score,
+    DROP COLUMN corpo_score,
+    DROP COLUMN fit_score,
+    DROP COLUMN fit_reasoning;
+
+ALTER TABLE job_analysis
+    ADD COLUMN language TEXT GENERATED ALWAYS AS (scores_jsonb->>'language') STORED,
+    ADD COLUMN short_summary TEXT GENERATED ALWAYS AS (scores_jsonb->>'short_summary') STORED,
+    ADD COLUMN cringe_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'cringe_score')::numeric)::int) STORED CHECK (cringe_score BETWEEN 0 AND 100),
+    ADD COLUMN januszex_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'januszex_score')::numeric)::int) STORED CHECK (januszex_score BETWEEN 0 AND 100),
+    ADD COLUMN work_culture_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'work_culture_score')::numeric)::int) STORED CHECK (work_culture_score BETWEEN 0 AND 100),
+    ADD COLUMN stability_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'stability_score')::numeric)::int) STORED CHECK (stability_score BETWEEN 0 AND 100),
+    ADD COLUMN benefit_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'benefit_score')::numeric)::int) STORED CHECK (benefit_score BETWEEN 0 AND 100),
+    ADD COLUMN lgbt_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'lgbt_score')::numeric)::int) STORED CHECK (lgbt_score BETWEEN 0 AND 100),
+    ADD COLUMN corpo_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'corpo_score')::numeric)::int) STORED CHECK (corpo_score BETWEEN 0 AND 100),
+    ADD COLUMN fit_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'fit_score')::numeric)::int) STORED CHECK (fit_score BETWEEN 0 AND 100),
+    ADD COLUMN fit_reasoning TEXT GENERATED ALWAYS AS (scores_jsonb->>'fit_reasoning') STORED;
+
+CREATE INDEX IF NOT EXISTS idx_analysis_fit_score ON job_analysis(fit_score DESC NULLS LAST);
+
+-- ============================================================================
+-- VIEW: Combined offer data
+-- ============================================================================
+CREATE OR REPLACE VIEW v_offers AS
+SELECT
+    l.id,
+    l.link,
+    l.status,
+    d.title,
+    d.company,
+    d.location,
+    d.remote_type,
+    d.contract_type,
+    d.exp_level,
+    d.employment_type,
+    d.salary_min,
+    d.salary_max,
+    d.salary_currency,
+    d.salary_rate,
+    d.salary_type,
+    d.tech_stack,
+    d.description,
+    a.language,
+    a.short_summary,
+    a.fit_score,
+    a.decision,
+    a.fit_reasoning,
+    a.cringe_score,
+    a.januszex_score,
+    a.work_culture_score,
+    a.stability_score,
+    l.discovered_at,
+    d.fetched_at,
+    a.analyzed_at
+FROM job_links l
+LEFT JOIN job_details d ON l.id = d.link_id
+LEFT JOIN job_analysis a ON l.id = a.link_id;
+
+-- ============================================================================
+-- VIEW: Top matches
+-- ============================================================================
+CREATE OR REPLACE VIEW v_top_matches AS
+SELECT
+    link,
+    title,
+    company,
+    location,
+    remote_type,
+    salary_min,
+    salary_max,
+    salary_currency,
+    fit_score,
+    decision,
+    short_summary,
+    fit_reasoning
+FROM v_offers
+WHERE decision = 'APPLY'
+ORDER BY fit_score DESC NULLS LAST;
+
+COMMENT ON VIEW v_offers IS 'Combined view joining all 3 phases';
+COMMENT ON VIEW v_top_matches IS 'APPLY offers sorted by fit score';
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- ============================================================================
+-- 002: job_details.llm_content
+-- ============================================================================
+-- The fetch step stores the LLM prompt body next to the details, so phase 3
+-- reads it instead of rebuilding it. Rows fetched before this stay NULL and
+-- are rebuilt from description + tech_stack as before.
+-- Fresh databases get this from schema.sql - run this only on existing ones:
+--   psql -U postgres -d justjoinit -f migrations/002_details_llm_content.sql
+
+ALTER TABLE job_details ADD COLUMN IF NOT EXISTS llm_content TEXT;
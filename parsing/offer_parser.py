@@ -1,38 +1,266 @@
 #!/usr/bin/env python3
 """Parser for single job offer detail page"""
 
+import hashlib
+import logging
 import re
-import subprocess
-from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional
+import threading
+from collections import OrderedDict
+
+import httpx
+import requests
+from bs4 import BeautifulSoup, NavigableString
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
+
+# Child of the pipeline's queued logger: fetch errors land in the same stderr stream as progress
+logger = logging.getLogger("pipeline.fetch")
+
+try:
+    import lxml  # noqa: F401 - C tree builder, several times faster than html.parser
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # Lexbor engine, fast plain-text extraction
+except ImportError:
+    LexborHTMLParser = None
+
+_HEADERS = {
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9',
+    'accept-language': 'pl-PL,pl;q=0.7',
+    'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
+}
+
+# One pooled session for all offer fetches: TCP/TLS connections to justjoin.it are reused
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Never visible text: scripts/hydration data, styles, icons, fallbacks
+_NON_CONTENT_TAGS = ('script', 'style', 'svg', 'path', 'noscript', 'template')
+_SCRIPT_STRIP = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.I | re.S)
+_SCRIPT_STRIP_BYTES = re.compile(_SCRIPT_STRIP.pattern.encode(), re.I | re.S)
+
+# Compiled once at import - parse_offer_detail runs them for every offer
+_LOC_PATTERNS = [re.compile(p, re.I) for p in (
+    r'Location:\s*([A-Za-zęółąśżźćńĘÓŁĄŚŻŹĆŃ\s,]+)',
+    r'Lokalizacja:\s*([A-Za-zęółąśżźćńĘÓŁĄŚŻŹĆŃ\s,]+)',
+    r'📍\s*([A-Za-zęółąśżźćńĘÓŁĄŚŻŹĆŃ\s,]+)',
+)]
+_TECH_LEVELS = ('advanced', 'regular', 'nice to have', 'expert')
+# Description markers in priority order (an earlier marker wins, wherever it is in the page)
+_DESC_MARKERS = ('job description', 'about the', 'your responsibilities', 'what you')
+_SECTION_RE = re.compile(
+    r'(?P<tech>Tech stack|Technology)'
+    r'|(?P<desc>Job description|About the|Your responsibilities|What you)'
+    r'|(?P<req>Our requirements|Requirements)'
+    r'|(?P<ben>Our offer|Benefits|We offer)',
+    re.I,
+)
+# Pattern: "9 000 - 16 000 PLN/month", "120 - 160 PLN/h" lub "15 000 PLN" (second amount optional).
+# Amounts have 2+ digits and everything up to the rate stays on one line (full_text is
+# '\n'-separated), so "Team of 5" + a "PLN ..." line below is not a salary
+_SALARY_RE = re.compile(
+    r'(\d[\d \u00a0\u202f]*?\d)(?:[ \t\u00a0\u202f]*[-–][ \t\u00a0\u202f]*(\d[\d \u00a0\u202f]*?\d))?'
+    r'[ \t\u00a0\u202f]*(PLN|USD|EUR|zł)(?:[ \t]*/[ \t]*(\w+))?',
+    re.I,
+)
+# Whitespace around line breaks + empty lines -> single '\n'
+_WS_COLLAPSE = re.compile(r'[ \t]*\n[ \t\n]*')
+# Thousands separators seen in amounts: space, (narrow) no-break space
+_STRIP_SPACE = str.maketrans('', '', ' \u00a0\u202f')
+# Rate suffix keyword -> salary_rate, checked in order (monthly before hourly before yearly)
+_RATE_MAP = {
+    'month': 'monthly', 'mies': 'monthly',
+    'h': 'hourly', 'hour': 'hourly', 'godz': 'hourly',
+    'year': 'yearly', 'rok': 'yearly', 'annual': 'yearly',
+}
+
+# Keyword -> (field, value, rank). Lower rank wins when several keywords of one field
+# appear, e.g. 'fully remote' beats 'hybrid' beats 'office'.
+_CLASSIFIER_TOKENS = {
+    'fully remote': ('remote_mode', 'remote', 0),
+    '100% remote': ('remote_mode', 'remote', 0),
+    'hybrid': ('remote_mode', 'hybrid', 1),
+    'on-site': ('remote_mode', 'onsite', 2),
+    'onsite': ('remote_mode', 'onsite', 2),
+    'office': ('remote_mode', 'onsite', 2),
+    'b2b': ('contract_type', 'b2b', 0),
+    'uop': ('contract_type', 'uop', 1),
+    'umowa o pracę': ('contract_type', 'uop', 1),
+    'senior': ('exp_level', 'senior', 0),
+    'junior': ('exp_level', 'junior', 1),
+    'full-time': ('employment_type', 'full-time', 0),
+    'full time': ('employment_type', 'full-time', 0),
+    'part-time': ('employment_type', 'part-time', 1),
+    'part time': ('employment_type', 'part-time', 1),
+    'gross': ('salary_type', 'gross', 0),
+    'brutto': ('salary_type', 'gross', 0),
+    'net': ('salary_type', 'net', 1),
+    'netto': ('salary_type', 'net', 1),
+}
+# Tokens are literals except where a word boundary is needed ('net' inside "network")
+_CLASSIFIER_PATTERNS = {'net': r'\bnet\b'}
+# Matched against already-lowercased text, so no re.I
+_CLASSIFIER_RE = re.compile('|'.join(
+    _CLASSIFIER_PATTERNS.get(token, re.escape(token))
+    for token in sorted(_CLASSIFIER_TOKENS, key=len, reverse=True)
+))
+_CLASSIFIER_FIELDS = {field for field, _, _ in _CLASSIFIER_TOKENS.values()}
+
+
+def _classify(text_lower: str) -> Dict[str, str]:
+    """Scan lowercased page text once for all classifier keywords -> {field: value}"""
+    best: Dict[str, tuple] = {}
+    settled = 0
+    for match in _CLASSIFIER_RE.finditer(text_lower):
+        field, value, rank = _CLASSIFIER_TOKENS[match.group(0)]
+        current = best.get(field)
+        if current is None or rank < current[0]:
+            best[field] = (rank, value)
+            if rank == 0:
+                settled += 1
+                if settled == len(_CLASSIFIER_FIELDS):  # Every field has its top keyword
+                    break
+    return {field: value for field, (_, value) in best.items()}
+
+
+class _LRUCache:
+    """Small thread-safe LRU"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# Offer pages are 100 KB - 1 MB; anything far bigger is not an offer page
+MAX_HTML_BYTES = 8 * 1024 * 1024
+_CHUNK_SIZE = 16384
+
+# Parsing is pure in the HTML: retries / re-runs of the same page skip BeautifulSoup entirely.
+# Pages themselves are not cached by URL - a 200 rate-limit page must not be served again
+_PARSE_CACHE = _LRUCache(maxsize=1024)
+
+
+def fetch_offer_html(url: str, session: Optional[requests.Session] = None) -> Optional[bytes]:
+    """Fetch raw offer HTML (UTF-8 bytes) over a keep-alive session (module-wide one by default)"""
+    try:
+        # Stream: a 429/403 or an oversized page is dropped on the headers, before its body is read
+        with (session or _SESSION).get(url, headers=_HEADERS, timeout=30, stream=True) as response:
+            if response.status_code != 200 or _too_large(response.headers):
+                return None
+            body = _read_capped(response.iter_content(chunk_size=_CHUNK_SIZE))
+        # Keep the body as bytes - the HTML parser decodes it once (no str round-trip, no charset sniffing)
+        if body is not None and len(body) > 1000:
+            return body
+    except requests.RequestException as e:
+        logger.warning("Error fetching %s: %s", url, e)
 
+    return None
 
-def fetch_offer_html(url: str) -> Optional[str]:
-    """Fetch offer HTML using curl"""
-    cmd = [
-        'curl', '-s', url,
-        '-H', 'accept: text/html,application/xhtml+xml,application/xml;q=0.9',
-        '-H', 'accept-language: pl-PL,pl;q=0.7',
-        '-H', 'user-agent: Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-    ]
 
+async def fetch_offer_html_async(client: httpx.AsyncClient, url: str) -> Optional[bytes]:
+    """fetch_offer_html on a caller-owned httpx.AsyncClient (for concurrent batch fetches)"""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0 and len(result.stdout) > 1000:
-            return result.stdout
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
+        async with client.stream('GET', url, headers=_HEADERS, timeout=30) as response:
+            if response.status_code != 200 or _too_large(response.headers):
+                return None
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_HTML_BYTES:
+                    return None
+                chunks.append(chunk)
+        body = b''.join(chunks)
+        if len(body) > 1000:
+            return body
+    except httpx.HTTPError as e:
+        logger.warning("Error fetching %s: %s", url, e)
 
     return None
 
 
-def parse_offer_detail(html: str) -> Dict[str, Any]:
+def _too_large(headers) -> bool:
+    length = headers.get('content-length')
+    return length is not None and length.isdigit() and int(length) > MAX_HTML_BYTES
+
+
+def _read_capped(chunks: Iterable[bytes]) -> Optional[bytes]:
+    """Join streamed chunks, giving up (None) once the body passes MAX_HTML_BYTES"""
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        if len(buf) > MAX_HTML_BYTES:
+            return None
+    return bytes(buf)
+
+
+def _make_soup(html: Union[str, bytes]) -> Tuple[BeautifulSoup, str]:
+    """Parse HTML once, drop non-content tags and return (soup, body full_text) for the extractors below"""
+    # Next.js inline scripts (self.__next_f.push payloads) are often half the page - cut them
+    # out of the raw HTML so the parser never tokenizes them
+    if isinstance(html, bytes):
+        # justjoin.it serves UTF-8: tell the parser instead of letting it detect the encoding
+        soup = BeautifulSoup(_SCRIPT_STRIP_BYTES.sub(b'', html), _HTML_PARSER, from_encoding='utf-8')
+    else:
+        soup = BeautifulSoup(_SCRIPT_STRIP.sub('', html), _HTML_PARSER)
+    # Remaining non-content tags (styles, icons, fallbacks) - remove before any text search
+    for tag in soup(_NON_CONTENT_TAGS):
+        tag.decompose()
+    # <head> holds only <title> (read separately) and meta - keep it out of the regex scans
+    body = soup.body or soup
+    return soup, body.get_text(separator='\n', strip=True)
+
+
+def parse_offer(html: Union[str, bytes]) -> Tuple[Dict[str, Any], str]:
+    """Parse offer HTML once -> (parse_offer_detail() result, extract_content_for_llm() text)"""
+    parsed, llm_content = _parse_cached(html, with_llm=True)
+    return dict(parsed), llm_content
+
+
+def parse_offer_detail(html: Union[str, bytes]) -> Dict[str, Any]:
     """
     Parse detailed offer page HTML
     Extract: title, company, location, salary, tech_stack, requirements, benefits, description
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    return dict(_parse_cached(html, with_llm=False)[0])
+
 
+def _parse_cached(html: Union[str, bytes], with_llm: bool) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Cached (parsed, llm_content); llm_content is only built (and kept) for callers that ask.
+
+    Callers get a top-level copy of `parsed` (they add / overwrite keys); the nested
+    tech_stack / requirements / benefits values are shared and must be treated as read-only.
+    """
+    raw = html if isinstance(html, bytes) else html.encode('utf-8', 'surrogatepass')
+    key = hashlib.blake2b(raw, digest_size=16).digest()
+    cached = _PARSE_CACHE.get(key)
+    if cached is None or (with_llm and cached[1] is None):
+        soup, full_text = _make_soup(html)
+        parsed = cached[0] if cached is not None else _parse_soup(soup, full_text)
+        cached = (parsed, _llm_content(full_text) if with_llm else None)
+        _PARSE_CACHE.put(key, cached)
+    return cached
+
+
+def _parse_soup(soup: BeautifulSoup, full_text: str) -> Dict[str, Any]:
     result = {
         'title': None,
         'company': None,
@@ -53,6 +281,7 @@ def parse_offer_detail(html: str) -> Dict[str, Any]:
     }
 
     # Title and Company - parse from <title> tag (format: "JobTitle - CompanyName")
+    title_text = ''
     title_elem = soup.find('title')
     if title_elem:
         title_text = title_elem.get_text(strip=True)
@@ -70,196 +299,169 @@ def parse_offer_detail(html: str) -> Dict[str, Any]:
         if h1_tag:
             result['title'] = h1_tag.get_text(strip=True)
 
-    # Get full text for pattern matching
-    full_text = soup.get_text()
-
     # Location - look for location patterns
-    location_patterns = [
-        r'Location:\s*([A-Za-zęółąśżźćńĘÓŁĄŚŻŹĆŃ\s,]+)',
-        r'Lokalizacja:\s*([A-Za-zęółąśżźćńĘÓŁĄŚŻŹĆŃ\s,]+)',
-        r'📍\s*([A-Za-zęółąśżźćńĘÓŁĄŚŻŹĆŃ\s,]+)',
-    ]
-    for pattern in location_patterns:
-        loc_match = re.search(pattern, full_text, re.I)
+    for pattern in _LOC_PATTERNS:
+        loc_match = pattern.search(full_text)
         if loc_match:
             result['location'] = loc_match.group(1).strip()[:100]
             break
 
-    # Tech stack - szukamy sekcji z językami/technologiami
-    # IMPORTANT: Remove script tags first (React/Next.js hydration scripts contain garbage)
-    for script in soup.find_all('script'):
-        script.decompose()
-
-    tech_sections = soup.find_all(string=re.compile(r'Tech stack|Technology', re.I))
-    tech_items = []
-
-    for section in tech_sections:
-        parent = section.find_parent()
-        if parent:
-            # Szukaj poziomów: advanced, regular, nice to have
-            siblings = parent.find_next_siblings()
-            for sib in siblings[:10]:  # Ogranicz do 10 następnych elementów
-                text = sib.get_text(strip=True)
-                # Filter out garbage: must be short, not contain script artifacts
-                if text and 5 < len(text) < 100 and 'self.__next_f' not in text and 'push([' not in text:
-                    # Parsuj format: "Python advanced" lub "Docker regular"
-                    match = re.match(r'(.+?)\s*(advanced|regular|nice to have|expert)?$', text, re.I)
-                    if match:
-                        tech = match.group(1).strip()
-                        # Skip if tech name contains script garbage
-                        if 'self.' not in tech and 'push' not in tech and '__next' not in tech:
-                            level = match.group(2) or 'regular'
-                            tech_items.append({'name': tech, 'level': level.lower()})
-
-    # Grupuj tech stack
-    for item in tech_items:
-        level = item['level']
-        if level not in result['tech_stack']:
-            result['tech_stack'][level] = []
-        result['tech_stack'][level].append(item['name'])
-
-    # Job description - główny tekst
-    desc_markers = ['Job description', 'About the', 'Your responsibilities', 'What you']
-    for marker in desc_markers:
-        section = soup.find(string=re.compile(marker, re.I))
-        if section:
-            parent = section.find_parent()
+    # Tech stack / Job description / Requirements / Benefits - jeden przebieg po węzłach tekstowych
+    # Tech stack: wszystkie sekcje; opis: pierwsze wystąpienie każdego markera, wybór wg _DESC_MARKERS
+    # po pętli; wymagania i benefity: pierwszy pasujący nagłówek
+    tech_stack = result['tech_stack']
+    desc_hits: Dict[str, Any] = {}
+    req_done = ben_done = False
+    for node in soup.descendants:
+        if not isinstance(node, NavigableString):
+            continue
+        matches = list(_SECTION_RE.finditer(node))
+        if not matches:
+            continue
+        kinds = {m.lastgroup for m in matches}
+        parent = node.find_parent()
+
+        if 'tech' in kinds and parent:
+            # Grupuj tech stack po poziomie
+            for tech, level in _tech_items(parent):
+                tech_stack.setdefault(level, []).append(tech)
+
+        for m in matches:
+            if m.lastgroup == 'desc':
+                desc_hits.setdefault(m.group('desc').lower(), parent)
+
+        if 'req' in kinds and not req_done:
+            req_done = True
             if parent:
-                # Zbierz następne paragrafy
-                desc_parts = []
-                for elem in parent.find_next_siblings()[:20]:
-                    text = elem.get_text(strip=True)
-                    if text and len(text) > 50:
-                        desc_parts.append(text)
-                    if len(desc_parts) >= 5:  # Max 5 paragrafów
-                        break
-
-                if desc_parts:
-                    result['description'] = '\n\n'.join(desc_parts)
-                    break
-
-    # Requirements
-    req_section = soup.find(string=re.compile(r'Our requirements|Requirements', re.I))
-    if req_section:
-        parent = req_section.find_parent()
-        if parent:
-            reqs = []
-            for elem in parent.find_next_siblings()[:15]:
-                text = elem.get_text(strip=True)
-                if text and 20 < len(text) < 200:
-                    reqs.append(text)
-            result['requirements'] = {'items': reqs}
-
-    # Benefits
-    benefits_section = soup.find(string=re.compile(r'Our offer|Benefits|We offer', re.I))
-    if benefits_section:
-        parent = benefits_section.find_parent()
-        if parent:
-            for elem in parent.find_next_siblings()[:15]:
-                text = elem.get_text(strip=True)
-                if text and 10 < len(text) < 200:
-                    result['benefits'].append(text)
-
-    # Remote mode - szukaj w całym dokumencie
-    full_text_lower = full_text.lower()
-    if 'fully remote' in full_text_lower or '100% remote' in full_text_lower:
-        result['remote_mode'] = 'remote'
-    elif 'hybrid' in full_text_lower:
-        result['remote_mode'] = 'hybrid'
-    elif 'on-site' in full_text_lower or 'onsite' in full_text_lower or 'office' in full_text_lower:
-        result['remote_mode'] = 'onsite'
-
-    # Contract type
-    if 'b2b' in full_text_lower:
-        result['contract_type'] = 'b2b'
-    elif 'uop' in full_text_lower or 'umowa o pracę' in full_text_lower:
-        result['contract_type'] = 'uop'
-
-    # Experience level
-    if 'senior' in full_text_lower:
-        result['exp_level'] = 'senior'
-    elif 'junior' in full_text_lower:
-        result['exp_level'] = 'junior'
-    else:
-        result['exp_level'] = 'mid'
+                result['requirements'] = {
+                    'items': [text for text in _sibling_texts(parent, 15) if 20 < len(text) < 200]
+                }
 
-    # Salary parsing - widełki lub pojedyncza kwota + rate + type
-    # Pattern: "9 000 - 16 000 PLN/month" lub "120 - 160 PLN/h"
-    salary_patterns = [
-        r'(\d[\d\s]+)\s*-\s*(\d[\d\s]+)\s*(PLN|USD|EUR|zł)(?:/(\w+))?',  # Range with optional rate
-        r'(\d[\d\s]+)\s*(PLN|USD|EUR|zł)(?:/(\w+))?',  # Single with optional rate
-    ]
-
-    for pattern in salary_patterns:
-        salary_match = re.search(pattern, full_text, re.I)
-        if salary_match:
-            groups = salary_match.groups()
-            if len(groups) == 4 and groups[2]:  # Range with optional rate
-                result['salary_min'] = int(groups[0].replace(' ', ''))
-                result['salary_max'] = int(groups[1].replace(' ', ''))
-                result['salary_currency'] = groups[2].upper().replace('ZŁ', 'PLN')
-                # Parse rate: month, h (hour), year
-                if groups[3]:
-                    rate_lower = groups[3].lower()
-                    if 'month' in rate_lower or 'mies' in rate_lower:
-                        result['salary_rate'] = 'monthly'
-                    elif 'h' in rate_lower or 'hour' in rate_lower or 'godz' in rate_lower:
-                        result['salary_rate'] = 'hourly'
-                    elif 'year' in rate_lower or 'rok' in rate_lower or 'annual' in rate_lower:
-                        result['salary_rate'] = 'yearly'
-            elif len(groups) == 3 and groups[1]:  # Single value with optional rate
-                amount = int(groups[0].replace(' ', ''))
-                result['salary_min'] = amount
-                result['salary_max'] = amount
-                result['salary_currency'] = groups[1].upper().replace('ZŁ', 'PLN')
-                if groups[2]:
-                    rate_lower = groups[2].lower()
-                    if 'month' in rate_lower or 'mies' in rate_lower:
-                        result['salary_rate'] = 'monthly'
-                    elif 'h' in rate_lower or 'hour' in rate_lower or 'godz' in rate_lower:
-                        result['salary_rate'] = 'hourly'
-                    elif 'year' in rate_lower or 'rok' in rate_lower or 'annual' in rate_lower:
-                        result['salary_rate'] = 'yearly'
+        if 'ben' in kinds and not ben_done:
+            ben_done = True
+            if parent:
+                result['benefits'] = [text for text in _sibling_texts(parent, 15) if 10 < len(text) < 200]
+        # No early exit: every tech stack section in the page is collected
+
+    # Job description - główny tekst: marker o najwyższym priorytecie, którego sekcja ma treść
+    for marker in _DESC_MARKERS:
+        parent = desc_hits.get(marker)
+        if parent is None:
+            continue
+        # Zbierz następne paragrafy
+        desc_parts = []
+        for text in _sibling_texts(parent, 20):
+            if len(text) > 50:
+                desc_parts.append(text)
+            if len(desc_parts) >= 5:  # Max 5 paragrafów
+                break
+        if desc_parts:
+            result['description'] = '\n\n'.join(desc_parts)
             break
 
-    # Salary type (gross/net) - search near salary info
+    # Remote mode / contract / level / employment - jeden przebieg po całym dokumencie
+    # (<title> dołączony: "Senior ..." bywa tylko w tytule, a full_text to sam <body>)
+    full_text_lower = f"{title_text}\n{full_text}".lower()
+    classified = _classify(full_text_lower)
+    salary_type = classified.pop('salary_type', None)
+    result.update(classified)
+    result['exp_level'] = result['exp_level'] or 'mid'
+
+    # Salary parsing - widełki lub pojedyncza kwota + rate + type
+    salary_match = _SALARY_RE.search(full_text)
+    if salary_match:
+        low, high, currency, rate = salary_match.groups()
+        salary_min = int(low.translate(_STRIP_SPACE))
+        currency = currency.upper()
+        result['salary_min'] = salary_min
+        result['salary_max'] = int(high.translate(_STRIP_SPACE)) if high else salary_min
+        result['salary_currency'] = 'PLN' if currency == 'ZŁ' else currency
+        result['salary_rate'] = _salary_rate(rate)
+
+    # Salary type (gross/net) - found by the classifier pass above
     if result['salary_min']:
-        # Look for gross/net keywords in context around salary
-        if re.search(r'gross|brutto', full_text_lower):
-            result['salary_type'] = 'gross'
-        elif re.search(r'\bnet\b|netto', full_text_lower):
-            result['salary_type'] = 'net'
-
-    # Employment type (Full-time, Part-time, etc.)
-    if 'full-time' in full_text_lower or 'full time' in full_text_lower:
-        result['employment_type'] = 'full-time'
-    elif 'part-time' in full_text_lower or 'part time' in full_text_lower:
-        result['employment_type'] = 'part-time'
+        result['salary_type'] = salary_type
 
     return result
 
 
-def extract_content_for_llm(parsed: Dict[str, Any], html: str) -> str:
+def extract_content_for_llm(parsed: Dict[str, Any], html: Union[str, bytes]) -> str:
     """
     Extract text content for LLM analysis
     Zoptymalizowane - tylko istotne fragmenty
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    if LexborHTMLParser is not None:
+        # Usuń skrypty, style, SVG i zbierz tekst (bez budowania drzewa BeautifulSoup)
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(list(_NON_CONTENT_TAGS))
+        root = tree.body or tree.root
+        text = root.text(separator='\n', strip=True) if root else ''
+    else:
+        _, text = _make_soup(html)
 
-    # Usuń skrypty, style, SVG
-    for tag in soup(['script', 'style', 'svg', 'path']):
-        tag.decompose()
+    return _llm_content(text)
+
+
+def _split_tech_level(text: str) -> Tuple[str, str]:
+    """'Python advanced' -> ('Python', 'advanced'); no trailing level keyword -> (text, 'regular')"""
+    lowered = text.lower()
+    for level in _TECH_LEVELS:
+        if lowered.endswith(level):
+            tech = text[:-len(level)].rstrip()
+            if tech:
+                return tech, level
+    return text, 'regular'
+
+
+def _salary_rate(rate: Optional[str]) -> Optional[str]:
+    """'month' / 'h' / 'rok' ... -> 'monthly' / 'hourly' / 'yearly'"""
+    if rate:
+        rate = rate.lower()
+        for keyword, value in _RATE_MAP.items():
+            if keyword in rate:
+                return value
+    return None
+
+
+def _tech_items(parent):
+    """(name, level) pairs from up to 10 siblings after a tech stack heading"""
+    # Szukaj poziomów: advanced, regular, nice to have
+    for text in _sibling_texts(parent, 10):  # Ogranicz do 10 następnych elementów
+        # Filter out garbage: must be short, not contain script artifacts
+        if 5 < len(text) < 100 and 'self.__next_f' not in text and 'push([' not in text:
+            # Parsuj format: "Python advanced" lub "Docker regular"
+            tech, level = _split_tech_level(text)
+            # Skip if tech name contains script garbage
+            if 'self.' not in tech and 'push' not in tech and '__next' not in tech:
+                yield tech, level
+
+
+def _next_tag_siblings(node, limit: int):
+    """Up to `limit` following sibling tags, walked lazily via next_sibling (text nodes skipped)"""
+    sibling = node.next_sibling
+    while sibling is not None and limit > 0:
+        if sibling.name is not None:
+            yield sibling
+            limit -= 1
+        sibling = sibling.next_sibling
+
+
+def _sibling_texts(parent, limit: int):
+    """Non-empty stripped texts of up to `limit` following sibling tags"""
+    for elem in _next_tag_siblings(parent, limit):
+        text = elem.get_text(strip=True)
+        if text:
+            yield text
 
-    # Zbierz tekst
-    text = soup.get_text(separator='\n', strip=True)
 
-    # Cleanup - usuń puste linie i nadmiar whitespace
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    cleaned = '\n'.join(lines)
+def _llm_content(text: str) -> str:
+    # Cleanup - usuń puste linie i nadmiar whitespace (jeden przebieg regexem)
+    cleaned = _WS_COLLAPSE.sub('\n', text).strip()
 
-    # Ogranicz długość do ~4000 znaków (żeby nie przekroczyć context LLM)
+    # Ogranicz długość do ~4000 znaków (żeby nie przekroczyć context LLM), tnij na końcu linii
     if len(cleaned) > 4000:
-        cleaned = cleaned[:4000] + "\n\n[...TRUNCATED...]"
+        cut = cleaned.rfind('\n', 0, 4000)
+        cleaned = cleaned[:cut if cut > 0 else 4000] + "\n\n[...TRUNCATED...]"
 
     return cleaned
 
@@ -2,22 +2,206 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
+import logging
+import multiprocessing
+import operator
 import os
+import queue
+import re
+import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Optional, Any, List
+from typing import Any, Callable, Dict, List, Optional
 
-from db.manager import DBManager
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from db.manager import DBManager, validate_analysis
 from llm.unified_scorer import UnifiedScorer
 from parsing.offer_parser import (
     extract_content_for_llm,
     fetch_offer_html,
+    fetch_offer_html_async,
     parse_offer_detail,
 )
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works the same
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Progress lines go through a queue to one writer thread: workers never block on stdout
+logger = logging.getLogger("pipeline")
+_log_listener: Optional[QueueListener] = None
+_log_listener_lock = threading.Lock()
+
+
+def _start_log_listener() -> None:
+    """Attach the queue handler + background stderr writer (once per process)"""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            return
+        log_queue: queue.Queue = queue.Queue(-1)
+        logger.addHandler(QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        _log_listener = QueueListener(log_queue, logging.StreamHandler(sys.stderr))
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+
+def _drain_log() -> None:
+    """Wait until queued progress lines are written (before callers print their summary)"""
+    with _log_listener_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
+            _log_listener.start()
+
+
+# job_details column -> parse_offer_detail() key
+_DETAIL_KEYS = (
+    ("title", "title"),
+    ("company", "company"),
+    ("location", "location"),
+    ("remote_type", "remote_mode"),
+    ("contract_type", "contract_type"),
+    ("exp_level", "exp_level"),
+    ("employment_type", "employment_type"),
+    ("salary_min", "salary_min"),
+    ("salary_max", "salary_max"),
+    ("salary_currency", "salary_currency"),
+    ("salary_rate", "salary_rate"),
+    ("salary_type", "salary_type"),
+    ("description", "description"),
+    ("tech_stack", "tech_stack"),
+)
+
+# job_details columns passed to the scorer as prompt metadata
+_META_KEYS = (
+    "company",
+    "title",
+    "location",
+    "remote_type",
+    "contract_type",
+    "exp_level",
+    "employment_type",
+    "salary_min",
+    "salary_max",
+    "salary_currency",
+    "salary_rate",
+    "salary_type",
+)
+_meta_getter = operator.itemgetter(*_META_KEYS)
+
+# Text that means we got a block / error page instead of an offer
+_ERROR_MARKERS = ("rate limit", "error 429", "too many requests", "access denied", "forbidden")
+# IGNORECASE instead of lowercasing: no copy of a description that can be tens of KB
+_ERROR_MARKER_RE = re.compile("|".join(map(re.escape, _ERROR_MARKERS)), re.IGNORECASE)
+
+
+def build_details(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Map parse_offer_detail() output to job_details columns (no validation)."""
+    details = {column: parsed.get(key) for column, key in _DETAIL_KEYS}
+    details["description"] = details["description"] or ""
+    if details["tech_stack"] is None:
+        details["tech_stack"] = {}
+    # Not a column - formatted once here for the LLM prompt
+    details["tech_stack_str"] = _format_tech_stack(details["tech_stack"])
+    # Stored with the details, so phase 3 / retries don't rebuild it
+    details["llm_content"] = _llm_content(details["description"], details["tech_stack_str"])
+    return details
+
+
+def _offer_metadata(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Scorer metadata from a build_details() dict (all _META_KEYS are always present)"""
+    return dict(zip(_META_KEYS, _meta_getter(details)))
+
+
+def _scorer_input(details: Dict[str, Any]) -> tuple:
+    """build_details() dict or saved job_details row → (llm_content, metadata) for the scorer"""
+    llm_content = details.get("llm_content")
+    if llm_content is None:
+        # Rows saved before llm_content was stored
+        llm_content = _llm_content(details.get("description"), _format_tech_stack(details.get("tech_stack")))
+    return llm_content, _offer_metadata(details)
+
+
+def _llm_content(description: Optional[str], tech_stack_str: str) -> str:
+    # Prepare LLM content (string, not dict!)
+    return f"{description or ''}\n\nTech stack: {tech_stack_str or 'N/A'}"
+
+
+def _format_tech_stack(tech_stack: Any) -> str:
+    """Tech stack as 'Python, Docker, ...' - the parser's {level: [names]}, a list or a string"""
+    if not tech_stack:
+        return ""
+    if isinstance(tech_stack, str):
+        return tech_stack
+    if isinstance(tech_stack, dict):
+        return ", ".join(name for names in tech_stack.values() for name in names)
+    return ", ".join(str(name) for name in tech_stack)
+
+
+def _validate_and_build_details(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Sanity-check parse_offer_detail() output and map it to job_details columns.
+
+    Raises ValueError on garbage / error pages so the link stays 'discovered' and is retried.
+    """
+    details = build_details(parsed)
+    description = details["description"]
+    title = details["title"]
+    company = details["company"]
+
+    # Check 1: Must have description (core field, min 500 chars for quality)
+    if len(description) < 500:
+        raise ValueError(f"Invalid parsing: description too short ({len(description)} chars, need ≥500)")
+
+    # Check 2: Rate limit / error pages detection (one regex pass for all markers)
+    if _ERROR_MARKER_RE.search(description):
+        raise ValueError("Rate limit or error page detected")
+
+    # Check 3: Core fields check (at least title OR company must exist)
+    if not title and not company:
+        raise ValueError("Invalid parsing: missing both title and company")
+
+    # Check 4: Too many NULLs check - count critical nulls
+    null_count = (not title) + (not company) + (not description)
+    if null_count >= 2:  # If 2+ critical fields are null, reject
+        raise ValueError(f"Too many NULL critical fields: {null_count}/3")
+
+    return details
+
+
+HTTP_POOL_SIZE = 16
+
+
+def _make_http_session(pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", _http_adapter(pool_maxsize))
+    return session
+
+
+def _http_adapter(pool_maxsize: int) -> HTTPAdapter:
+    # Connection errors only: retrying 429s would just hammer the site harder
+    return HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    )
+
 
 @dataclass
 class OfferPipeline:
@@ -26,181 +210,302 @@ class OfferPipeline:
     rate_limit_seconds: float = field(
         default_factory=lambda: float(os.getenv("PIPELINE_RATE_LIMIT", "2.0"))
     )
+    # Concurrent runs buffer finished analyses and write them in batches
+    analysis_batch_size: int = field(
+        default_factory=lambda: int(os.getenv("PIPELINE_ANALYSIS_BATCH_SIZE", "50"))
+    )
+    analysis_flush_seconds: float = field(
+        default_factory=lambda: float(os.getenv("PIPELINE_ANALYSIS_FLUSH_SECONDS", "5.0"))
+    )
+    # fetch_details / process_one_by_one queue details + status updates and write them in batches
+    details_batch_size: int = field(
+        default_factory=lambda: int(os.getenv("PIPELINE_DETAILS_BATCH_SIZE", "100"))
+    )
+    _pending_details: List[tuple] = field(default_factory=list, init=False, repr=False)
+    # link_id -> latest status, so a queued 'fetched' never overwrites a later 'analyzed'
+    _pending_status: Dict[int, str] = field(default_factory=dict, init=False, repr=False)
+    _pending_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    # Links whose queued write failed after they were already counted as a success
+    _lost_writes: int = field(default=0, init=False, repr=False, compare=False)
+    # Concurrent paths parse HTML in worker processes (pure-Python parsing holds the GIL);
+    # unset = min(run's worker count, CPU count)
+    parse_workers: Optional[int] = field(
+        default_factory=lambda: int(os.getenv("PIPELINE_PARSE_WORKERS", "0")) or None
+    )
+    _parse_pool: Optional[ProcessPoolExecutor] = field(default=None, init=False, repr=False, compare=False)
+    _parse_pool_size: int = field(default=1, init=False, repr=False, compare=False)
+    _parse_pool_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    # Keep-alive session for offer pages; its pool must fit every worker thread
+    http: requests.Session = field(default_factory=lambda: _make_http_session(HTTP_POOL_SIZE), repr=False, compare=False)
+    http_pool_size: int = field(default=HTTP_POOL_SIZE, init=False, repr=False, compare=False)
+    # Spaces offer-page fetches of the sequential and threaded modes (shared by all workers)
+    _fetch_limiter: "_RateLimiter" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        _start_log_listener()
+        self._fetch_limiter = _RateLimiter(self.rate_limit_seconds)
+
+    @property
+    def parse_pool(self) -> ProcessPoolExecutor:
+        """Lazily started process pool for parse_offer_detail (sized by _size_parse_pool)"""
+        if self._parse_pool is None:
+            with self._parse_pool_lock:
+                if self._parse_pool is None:
+                    # spawn, not fork: the pool is first used from worker threads, and forking a
+                    # threaded process can copy a held lock into the child
+                    self._parse_pool = ProcessPoolExecutor(
+                        max_workers=self._parse_pool_size,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._parse_pool
+
+    def _size_parse_pool(self, max_workers: int) -> None:
+        """Size the parse pool for a run with max_workers workers (call before the run starts)"""
+        size = self.parse_workers or max(1, min(max_workers, os.cpu_count() or 1))
+        if size != self._parse_pool_size and self._parse_pool is not None:
+            # No parse is in flight between runs, so the old pool can go
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+        self._parse_pool_size = size
+
+    def _parse(self, html: bytes) -> Dict[str, Any]:
+        """parse_offer_detail() in the parse pool (blocks the calling worker thread only)"""
+        return self.parse_pool.submit(parse_offer_detail, html).result()
+
+    def close(self) -> None:
+        """Shut down the parse pool and HTTP session (DB and LLM clients belong to their owners)"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+        self.http.close()
+
+    def __enter__(self) -> "OfferPipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     # ========================================
     # PHASE 1: Link Discovery
     # ========================================
 
     def load_offers_file(self, offers_path: Path) -> int:
-        """Phase 1: Load links from offers.json → job_links"""
-        if not offers_path.exists():
-            raise FileNotFoundError(f"Offers file not found: {offers_path}")
+        """Phase 1: Load links from offers.json → job_links. Returns the number of new links."""
+        try:
+            offers = _json_loads(offers_path.read_bytes())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Offers file not found: {offers_path}") from None
 
-        with offers_path.open("r", encoding="utf-8") as fh:
-            offers = json.load(fh)
-
-        inserted = 0
-        for offer in offers:
-            link = offer.get("link")
-            if link:
-                self.db.insert_link(link)
-                inserted += 1
-
-        return inserted
+        # One INSERT ... ON CONFLICT DO NOTHING; returns only the links that were new
+        links = [offer["link"] for offer in offers if offer.get("link")]
+        return self.db.insert_links_bulk(links)
 
     # ========================================
     # PHASE 2: Detail Fetching
     # ========================================
 
-    def fetch_details(self, limit: Optional[int] = None) -> Dict[str, int]:
+    def fetch_details(self, limit: Optional[int] = None, max_workers: int = 4) -> Dict[str, int]:
         """Phase 2: Fetch details for 'discovered' links → job_details"""
-        links = self.db.get_links_by_status("discovered", limit=limit)
+        try:
+            return asyncio.run(self._fetch_details_async(limit, max_workers))
+        finally:
+            _drain_log()
+
+    async def _fetch_details_async(self, limit: Optional[int], max_workers: int) -> Dict[str, int]:
+        """Up to max_workers pages in flight over one keep-alive client; request starts
+        stay rate_limit_seconds apart, parsing + DB writes run in the default executor."""
+        loop = asyncio.get_running_loop()
+        links = await loop.run_in_executor(None, self.db.get_links_by_status, "discovered", limit)
         total = len(links)
         if not total:
             return {"success": 0, "failed": 0, "total": 0}
 
-        success = 0
-        failed = 0
+        self._size_parse_pool(max_workers)
+        sem = asyncio.Semaphore(max_workers)
+        limiter = _RateLimiter(self.rate_limit_seconds)
+        limits = httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers)
+
+        async with httpx.AsyncClient(limits=limits, follow_redirects=True) as client:
+
+            async def fetch_single_offer(row: Dict[str, Any]) -> tuple:
+                """Returns (link, description length or None, error message)"""
+                link = row["link"]
+                try:
+                    # The slot also covers parse + save, so at most max_workers pooled DB connections are in use
+                    async with sem:
+                        await limiter.wait()
+                        html = await fetch_offer_html_async(client, link)
+                        if not html or len(html) < 1000:
+                            raise ValueError("Invalid HTML (too short)")
+                        desc_len = await loop.run_in_executor(None, self._save_fetched, row["id"], html)
+                    return link, desc_len, None
+                except Exception as exc:
+                    return link, None, str(exc)
+
+            success = 0
+            failed = 0
+            self._take_lost_writes()
+            try:
+                for idx, next_done in enumerate(
+                    asyncio.as_completed([fetch_single_offer(row) for row in links]), start=1
+                ):
+                    link, desc_len, error = await next_done
+                    if error is None:
+                        logger.info("[%d/%d] ✓ Fetched %s (desc: %d chars)", idx, total, link, desc_len)
+                        success += 1
+                    else:
+                        logger.info("[%d/%d] ✗ Failed %s: %s", idx, total, link, error)
+                        failed += 1
+            finally:
+                await loop.run_in_executor(None, self._flush_pending)
 
-        for idx, row in enumerate(links, start=1):
-            link_id = row["id"]
-            link = row["link"]
+        # Counted when queued - move offers whose batch never reached the DB to failed
+        lost = self._take_lost_writes()
+        return {"success": success - lost, "failed": failed + lost, "total": success + failed}
 
-            try:
-                print(f"[{idx}/{total}] Fetching {link}", flush=True)
-                html = fetch_offer_html(link)
-                if not html or len(html) < 1000:
-                    raise ValueError("Invalid HTML (too short)")
-
-                parsed = parse_offer_detail(html)
-
-                # VALIDATION: Sanity checks to prevent garbage data
-                description = parsed.get("description", "")
-                title = parsed.get("title")
-                company = parsed.get("company")
-
-                # Check 1: Must have description (core field, min 500 chars for quality)
-                if not description or len(description) < 500:
-                    raise ValueError(f"Invalid parsing: description too short ({len(description)} chars, need ≥500)")
-
-                # Check 2: Rate limit / error pages detection
-                desc_lower = description.lower()
-                if any(marker in desc_lower for marker in ["rate limit", "error 429", "too many requests", "access denied", "forbidden"]):
-                    raise ValueError("Rate limit or error page detected")
-
-                # Check 3: Core fields check (at least title OR company must exist)
-                if not title and not company:
-                    raise ValueError("Invalid parsing: missing both title and company")
-
-                # Check 4: Too many NULLs check - count critical nulls
-                critical_fields = [title, company, description]
-                null_count = sum(1 for field in critical_fields if not field)
-                if null_count >= 2:  # If 2+ critical fields are null, reject
-                    raise ValueError(f"Too many NULL critical fields: {null_count}/3")
-
-                # Extract details (parser now returns all fields directly)
-                details = {
-                    "title": title,
-                    "company": company,
-                    "location": parsed.get("location"),
-                    "remote_type": parsed.get("remote_mode"),
-                    "contract_type": parsed.get("contract_type"),
-                    "exp_level": parsed.get("exp_level"),
-                    "employment_type": parsed.get("employment_type"),
-                    "salary_min": parsed.get("salary_min"),
-                    "salary_max": parsed.get("salary_max"),
-                    "salary_currency": parsed.get("salary_currency"),
-                    "salary_rate": parsed.get("salary_rate"),
-                    "salary_type": parsed.get("salary_type"),
-                    "description": description,
-                    "tech_stack": parsed.get("tech_stack", {}),
-                }
-
-                self.db.save_details(link_id, details)
-                self.db.update_link_status(link_id, "fetched")
-
-                print(f"[{idx}/{total}] ✓ Fetched (desc: {len(description)} chars)", flush=True)
-                success += 1
+    def _save_fetched(self, link_id: int, html: bytes) -> int:
+        """Parse + validate + save details for one fetched page. Returns description length."""
+        details = self._details_from_html(html)
+        self._queue_details(link_id, details)
+        return len(details["description"])
 
-            except Exception as exc:
-                print(f"[{idx}/{total}] ✗ Failed: {exc}", flush=True)
-                failed += 1
+    # ========================================
+    # Shared fetch → parse → validate steps
+    # ========================================
 
-            finally:
-                if self.rate_limit_seconds > 0:
-                    time.sleep(self.rate_limit_seconds)
+    def _details_from_html(self, html: Optional[bytes], parse: Optional[Callable] = None) -> Dict[str, Any]:
+        """Parse (in the parse pool unless `parse` is given) and validate one page → details"""
+        if not html:
+            raise ValueError("Empty HTML response")
+        parsed = (parse or self._parse)(html)
+        # VALIDATION: Sanity checks to prevent garbage data
+        return _validate_and_build_details(parsed)
+
+    def _fetch_and_parse(self, link: str, parse: Optional[Callable] = None) -> Dict[str, Any]:
+        """Fetch one offer page over the pipeline's session → validated details
+
+        Fetch starts stay rate_limit_seconds apart across all worker threads; time spent
+        parsing / analyzing since the previous start already counts towards the gap.
+        """
+        self._fetch_limiter.wait_sync()
+        return self._details_from_html(fetch_offer_html(link, session=self.http), parse)
 
-        return {"success": success, "failed": failed, "total": success + failed}
+    # ========================================
+    # Batched details / status writes
+    # ========================================
+
+    def _queue_details(self, link_id: int, details: Dict[str, Any]) -> None:
+        """Queue a details row (+ 'fetched' status); flushes every details_batch_size rows"""
+        with self._pending_lock:
+            self._pending_details.append((link_id, details))
+            self._pending_status[link_id] = "fetched"
+            full = len(self._pending_details) >= self.details_batch_size
+        if full:
+            self._flush_pending()
+
+    def _queue_status(self, link_id: int, status: str) -> None:
+        with self._pending_lock:
+            self._pending_status[link_id] = status
+
+    def _flush_pending(self) -> None:
+        """Write queued details, then statuses (a link is only 'fetched' once its details exist)"""
+        with self._pending_lock:
+            details, self._pending_details = self._pending_details, []
+            statuses, self._pending_status = self._pending_status, {}
+        if not details and not statuses:
+            return
+        try:
+            self.db.save_details_bulk(details)
+            self.db.update_link_status_bulk(list(statuses.items()))
+        except Exception as exc:
+            # Links keep their old status and are picked up again on the next run
+            logger.error("✗ Failed to save %d details / %d statuses: %s", len(details), len(statuses), exc)
+            lost = {link_id for link_id, _ in details}.union(statuses)
+            with self._pending_lock:
+                self._lost_writes += len(lost)
+
+    def _take_lost_writes(self) -> int:
+        """Number of links counted as done whose batched write failed since the last call"""
+        with self._pending_lock:
+            lost, self._lost_writes = self._lost_writes, 0
+        return lost
 
     # ========================================
     # PHASE 3: LLM Analysis
     # ========================================
 
-    def analyze_offers(self, limit: Optional[int] = None) -> Dict[str, int]:
+    def analyze_offers(self, limit: Optional[int] = None, max_workers: int = 8) -> Dict[str, int]:
         """Phase 3: Run LLM analysis on 'fetched' offers → job_analysis"""
-        links = self.db.get_links_by_status("fetched", limit=limit)
+        try:
+            return asyncio.run(self._analyze_offers_async(limit, max_workers))
+        finally:
+            _drain_log()
+
+    async def _analyze_offers_async(self, limit: Optional[int], max_workers: int) -> Dict[str, int]:
+        """Up to max_workers LLM calls in flight; call starts stay rate_limit_seconds apart.
+
+        Details for every link are loaded in one query up front, and validated analyses
+        go to an _AnalysisWriter thread, so no DB round-trip sits between LLM calls.
+        Links are marked 'analyzed' only once their batch is committed (failed runs stay
+        'fetched' and are retried).
+        """
+        loop = asyncio.get_running_loop()
+        links = await loop.run_in_executor(None, self.db.get_links_by_status, "fetched", limit)
         total = len(links)
         if not total:
             return {"success": 0, "failed": 0, "total": 0}
+        details_by_id = await loop.run_in_executor(
+            None, self.db.get_details_by_link_ids, [row["id"] for row in links]
+        )
 
-        success = 0
-        failed = 0
+        sem = asyncio.Semaphore(max_workers)
+        limiter = _RateLimiter(self.rate_limit_seconds)
 
-        for idx, row in enumerate(links, start=1):
+        async def analyze_single_offer(row: Dict[str, Any]) -> tuple:
+            """Returns (link_id, link, analysis or None, message)"""
             link_id = row["id"]
-            link = row["link"]
-
             try:
-                print(f"[{idx}/{total}] Analyzing {link}", flush=True)
-
-                # Get details
-                details = self.db.get_details_by_link_id(link_id)
-                if not details:
-                    raise ValueError("No details found")
-
-                # Prepare LLM content (string, not dict!)
-                description = details.get("description", "")
-                tech_stack = details.get("tech_stack", [])
-                llm_content = f"{description}\n\nTech stack: {', '.join(tech_stack) if tech_stack else 'N/A'}"
-
-                metadata = {
-                    "company": details.get("company"),
-                    "title": details.get("title"),
-                    "location": details.get("location"),
-                    "remote_type": details.get("remote_type"),
-                    "contract_type": details.get("contract_type"),
-                    "salary_min": details.get("salary_min"),
-                    "salary_max": details.get("salary_max"),
-                    "salary_currency": details.get("salary_currency"),
-                }
-
-                # Run LLM
-                analysis = self.scorer.score_offer(
-                    content=llm_content,
-                    metadata=metadata,
-                )
-
-                # CRITICAL: Save analysis FIRST, update status ONLY if save succeeds
-                # This ensures failed LLM runs (bad JSON, missing fields) can be retried
-                self.db.save_analysis(link_id, analysis)
-
-                # Only mark as analyzed if save succeeded (no exception thrown)
-                self.db.update_link_status(link_id, "analyzed")
+                async with sem:
+                    llm_content, metadata = self._analysis_input(details_by_id.get(link_id))
+                    await limiter.wait()
+                    analysis = await self.scorer.score_offer_async(content=llm_content, metadata=metadata)
+                validate_analysis(analysis)
 
                 decision = analysis.get("decision", "WATCH")
                 fit = analysis.get("fit_score", 0)
-                print(f"[{idx}/{total}] ✓ {decision} (fit={fit:.0f})", flush=True)
-                success += 1
+                return link_id, row["link"], analysis, f"{decision} (fit={fit:.0f})"
 
             except Exception as exc:
-                print(f"[{idx}/{total}] ✗ Failed: {exc}", flush=True)
-                failed += 1
+                return link_id, row["link"], None, str(exc)
 
-            finally:
-                if self.rate_limit_seconds > 0:
-                    time.sleep(self.rate_limit_seconds)
+        failed = 0
+        writer = _AnalysisWriter(self.db, self.analysis_batch_size, self.analysis_flush_seconds)
+
+        try:
+            for idx, next_done in enumerate(
+                asyncio.as_completed([analyze_single_offer(row) for row in links]), start=1
+            ):
+                link_id, link, analysis, msg = await next_done
+                if analysis is not None:
+                    logger.info("[%d/%d] ✓ %s %s", idx, total, msg, link)
+                    writer.add(link_id, analysis)
+                else:
+                    logger.info("[%d/%d] ✗ Failed %s: %s", idx, total, link, msg)
+                    failed += 1
+        finally:
+            # Waits for the last batch to be written
+            await loop.run_in_executor(None, writer.close)
+            await self.scorer.client.aclose()
+
+        failed += writer.failed
+        return {"success": writer.saved, "failed": failed, "total": writer.saved + failed}
 
-        return {"success": success, "failed": failed, "total": success + failed}
+    @staticmethod
+    def _analysis_input(details: Optional[Dict[str, Any]]) -> tuple:
+        """Saved details for one link → (llm_content, metadata) for the scorer"""
+        if not details:
+            raise ValueError("No details found")
+        return _scorer_input(details)
 
     # ========================================
     # COMBINED: Run all 3 phases
@@ -232,114 +537,65 @@ class OfferPipeline:
 
         success = 0
         failed = 0
+        self._take_lost_writes()
+
+        try:
+            for idx, row in enumerate(links, start=1):
+                link_id = row["id"]
+                link = row["link"]
+
+                try:
+                    # STEP 1: Fetch
+                    logger.info("[%d/%d] Fetching %s", idx, total, link)
+                    # One page at a time: parse inline, the process pool would only add IPC
+                    details = self._fetch_and_parse(link, parse=parse_offer_detail)
+                    self._queue_details(link_id, details)
+
+                    logger.info("[%d/%d] ✓ Fetched (desc: %d chars)", idx, total, len(details["description"]))
+
+                    # STEP 2: Analyze immediately
+                    logger.info("[%d/%d] Analyzing...", idx, total)
+                    llm_content, metadata = _scorer_input(details)
+
+                    # Run LLM
+                    analysis = self.scorer.score_offer(
+                        content=llm_content,
+                        metadata=metadata,
+                    )
+
+                    # CRITICAL: Save analysis FIRST, update status ONLY if save succeeds
+                    self.db.save_analysis(link_id, analysis)
+                    self._queue_status(link_id, "analyzed")
+
+                    logger.info(
+                        "[%d/%d] ✓ %s (fit=%.0f)", idx, total,
+                        analysis.get("decision", "WATCH"), analysis.get("fit_score", 0),
+                    )
+                    success += 1
 
-        for idx, row in enumerate(links, start=1):
-            link_id = row["id"]
-            link = row["link"]
+                except Exception as exc:
+                    logger.info("[%d/%d] ✗ Failed: %s", idx, total, exc)
+                    failed += 1
+        finally:
+            # Details / statuses still queued from the last partial batch
+            self._flush_pending()
+            _drain_log()
 
-            try:
-                # STEP 1: Fetch
-                print(f"[{idx}/{total}] Fetching {link}", flush=True)
-                html = fetch_offer_html(link)
-                if not html:
-                    raise ValueError("Empty HTML response")
-
-                # Parse
-                parsed = parse_offer_detail(html)
-
-                # VALIDATION: Sanity checks to prevent garbage data
-                description = parsed.get("description", "")
-                title = parsed.get("title")
-                company = parsed.get("company")
-
-                # Check 1: Must have description (core field, min 500 chars for quality)
-                if not description or len(description) < 500:
-                    raise ValueError(f"Invalid parsing: description too short ({len(description)} chars, need ≥500)")
-
-                # Check 2: Rate limit / error pages detection
-                desc_lower = description.lower()
-                if any(marker in desc_lower for marker in ["rate limit", "error 429", "too many requests", "access denied", "forbidden"]):
-                    raise ValueError("Rate limit or error page detected")
-
-                # Check 3: Core fields check (at least title OR company must exist)
-                if not title and not company:
-                    raise ValueError("Invalid parsing: missing both title and company")
-
-                # Check 4: Too many NULLs check - count critical nulls
-                critical_fields = [title, company, description]
-                null_count = sum(1 for field in critical_fields if not field)
-                if null_count >= 2:  # If 2+ critical fields are null, reject
-                    raise ValueError(f"Too many NULL critical fields: {null_count}/3")
-
-                # Save details
-                details = {
-                    "title": title,
-                    "company": company,
-                    "location": parsed.get("location"),
-                    "remote_type": parsed.get("remote_mode"),
-                    "contract_type": parsed.get("contract_type"),
-                    "exp_level": parsed.get("exp_level"),
-                    "employment_type": parsed.get("employment_type"),
-                    "salary_min": parsed.get("salary_min"),
-                    "salary_max": parsed.get("salary_max"),
-                    "salary_currency": parsed.get("salary_currency"),
-                    "salary_rate": parsed.get("salary_rate"),
-                    "salary_type": parsed.get("salary_type"),
-                    "description": description,
-                    "tech_stack": parsed.get("tech_stack", {}),
-                }
-
-                self.db.save_details(link_id, details)
-                self.db.update_link_status(link_id, "fetched")
-
-                print(f"[{idx}/{total}] ✓ Fetched (desc: {len(description)} chars)", flush=True)
-
-                # STEP 2: Analyze immediately
-                print(f"[{idx}/{total}] Analyzing...", flush=True)
-
-                # Prepare LLM content
-                tech_stack = details.get("tech_stack", [])
-                llm_content = f"{description}\n\nTech stack: {', '.join(tech_stack) if tech_stack else 'N/A'}"
-
-                metadata = {
-                    "company": details.get("company"),
-                    "title": details.get("title"),
-                    "location": details.get("location"),
-                    "remote_type": details.get("remote_type"),
-                    "contract_type": details.get("contract_type"),
-                    "exp_level": details.get("exp_level"),
-                    "employment_type": details.get("employment_type"),
-                    "salary_min": details.get("salary_min"),
-                    "salary_max": details.get("salary_max"),
-                    "salary_currency": details.get("salary_currency"),
-                    "salary_rate": details.get("salary_rate"),
-                    "salary_type": details.get("salary_type"),
-                }
-
-                # Run LLM
-                analysis = self.scorer.score_offer(
-                    content=llm_content,
-                    metadata=metadata,
-                )
-
-                # CRITICAL: Save analysis FIRST, update status ONLY if save succeeds
-                self.db.save_analysis(link_id, analysis)
-                self.db.update_link_status(link_id, "analyzed")
+        # Counted when queued - move offers whose batch never reached the DB to failed
+        lost = self._take_lost_writes()
+        return {"success": success - lost, "failed": failed + lost, "total": success + failed}
 
-                decision = analysis.get("decision", "WATCH")
-                fit = analysis.get("fit_score", 0)
-                print(f"[{idx}/{total}] ✓ {decision} (fit={fit:.0f})", flush=True)
-                success += 1
+    def _fetch_offer(self, row: Dict[str, Any]) -> tuple:
+        """Fetch + parse + save details for one offer. Returns (llm_content, metadata) for scoring."""
+        link_id = row["id"]
+        details = self._fetch_and_parse(row["link"])
 
-            except Exception as exc:
-                print(f"[{idx}/{total}] ✗ Failed: {exc}", flush=True)
-                failed += 1
+        # Written right away: the 'analyzed' status comes from _AnalysisBuffer, which a
+        # queued 'fetched' must not overwrite later
+        self.db.save_details(link_id, details)
+        self.db.update_link_status(link_id, "fetched")
 
-            finally:
-                if self.rate_limit_seconds > 0:
-                    time.sleep(self.rate_limit_seconds)
-
-        return {"success": success, "failed": failed, "total": success + failed}
+        return _scorer_input(details)
 
     def process_concurrent(self, limit: Optional[int] = None, max_workers: int = 4) -> Dict[str, int]:
         """Process offers concurrently: fetch → analyze (parallel workers)
@@ -356,103 +612,188 @@ class OfferPipeline:
         if not total:
             return {"success": 0, "failed": 0, "total": 0}
 
-        success = 0
-        failed = 0
+        # One pooled connection per worker thread, otherwise urllib3 discards the extras
+        if max_workers > self.http_pool_size:
+            old_adapter = self.http.get_adapter("https://")
+            self.http.mount("https://", _http_adapter(max_workers))
+            # Drop the old pool's idle keep-alive sockets instead of leaking them
+            old_adapter.close()
+            self.http_pool_size = max_workers
+        self._size_parse_pool(max_workers)
+
         processed = 0
+        failed = 0
 
         def process_single_offer(row: Dict[str, Any]) -> tuple:
-            """Process one offer (fetch + analyze). Returns (link_id, link, success, error_msg)"""
+            """Process one offer (fetch + analyze). Returns (link_id, analysis or None, message)"""
             link_id = row["id"]
-            link = row["link"]
 
             try:
-                # STEP 1: Fetch
-                html = fetch_offer_html(link)
-                if not html:
-                    raise ValueError("Empty HTML response")
-
-                # Parse
-                parsed = parse_offer_detail(html)
-
-                # VALIDATION
-                description = parsed.get("description", "")
-                title = parsed.get("title")
-                company = parsed.get("company")
-
-                if not description or len(description) < 500:
-                    raise ValueError(f"description too short ({len(description)} chars)")
-
-                if any(m in description.lower() for m in ["rate limit", "error 429"]):
-                    raise ValueError("Rate limit detected")
-
-                if not title and not company:
-                    raise ValueError("Missing title and company")
-
-                # Save details
-                details = {
-                    "title": title,
-                    "company": company,
-                    "location": parsed.get("location"),
-                    "remote_type": parsed.get("remote_mode"),
-                    "contract_type": parsed.get("contract_type"),
-                    "exp_level": parsed.get("exp_level"),
-                    "employment_type": parsed.get("employment_type"),
-                    "salary_min": parsed.get("salary_min"),
-                    "salary_max": parsed.get("salary_max"),
-                    "salary_currency": parsed.get("salary_currency"),
-                    "salary_rate": parsed.get("salary_rate"),
-                    "salary_type": parsed.get("salary_type"),
-                    "description": description,
-                    "tech_stack": parsed.get("tech_stack", {}),
-                }
-
-                self.db.save_details(link_id, details)
-                self.db.update_link_status(link_id, "fetched")
-
-                # STEP 2: Analyze
-                tech_stack = details.get("tech_stack", [])
-                llm_content = f"{description}\n\nTech stack: {', '.join(tech_stack) if tech_stack else 'N/A'}"
-
-                metadata = {
-                    "company": details.get("company"),
-                    "title": details.get("title"),
-                    "location": details.get("location"),
-                    "remote_type": details.get("remote_type"),
-                    "contract_type": details.get("contract_type"),
-                    "exp_level": details.get("exp_level"),
-                    "employment_type": details.get("employment_type"),
-                    "salary_min": details.get("salary_min"),
-                    "salary_max": details.get("salary_max"),
-                    "salary_currency": details.get("salary_currency"),
-                    "salary_rate": details.get("salary_rate"),
-                    "salary_type": details.get("salary_type"),
-                }
+                llm_content, metadata = self._fetch_offer(row)
 
                 analysis = self.scorer.score_offer(content=llm_content, metadata=metadata)
-                self.db.save_analysis(link_id, analysis)
-                self.db.update_link_status(link_id, "analyzed")
+                # Validate here so one bad LLM response can't poison the batched write
+                validate_analysis(analysis)
 
                 decision = analysis.get("decision", "WATCH")
                 fit = analysis.get("fit_score", 0)
 
-                return (link_id, link, True, f"{decision} (fit={fit:.0f})")
+                return (link_id, analysis, f"{decision} (fit={fit:.0f})")
 
             except Exception as exc:
-                return (link_id, link, False, str(exc))
+                return (link_id, None, str(exc))
+
+        buffer = _AnalysisBuffer(self.db, self.analysis_batch_size, self.analysis_flush_seconds)
 
         # Process concurrently
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_link = {executor.submit(process_single_offer, row): row for row in links}
+            futures = [executor.submit(process_single_offer, row) for row in links]
 
-            for future in as_completed(future_to_link):
+            for future in as_completed(futures):
                 processed += 1
-                link_id, link, is_success, msg = future.result()
+                link_id, analysis, msg = future.result()
 
-                if is_success:
-                    print(f"[{processed}/{total}] ✓ {msg}", flush=True)
-                    success += 1
+                if analysis is not None:
+                    logger.info("[%d/%d] ✓ %s", processed, total, msg)
+                    buffer.add(link_id, analysis)
                 else:
-                    print(f"[{processed}/{total}] ✗ {msg}", flush=True)
+                    logger.info("[%d/%d] ✗ %s", processed, total, msg)
                     failed += 1
 
-        return {"success": success, "failed": failed, "total": success + failed}
+        buffer.flush()
+        failed += buffer.failed
+        _drain_log()
+
+        return {"success": buffer.saved, "failed": failed, "total": buffer.saved + failed}
+
+
+class _RateLimiter:
+    """Spaces request starts at least `interval` seconds apart across all tasks / threads.
+
+    Keeps the old one-request-per-rate_limit_seconds pace towards justjoin.it while
+    the network waits of in-flight requests overlap. Each caller reserves the next
+    free start slot under a lock, then sleeps outside it until that slot.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Claim the next start slot, return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+            return start - now
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def wait_sync(self) -> None:
+        """wait() for worker threads / the sequential loop"""
+        if self.interval <= 0:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Batches at least this big go through COPY instead of multi-row INSERTs. Below a few
+# hundred rows the temp table (catalog churn + WAL) costs more than it saves, so normal
+# runs stay on execute_values; bulk backfills opt in with PIPELINE_ANALYSIS_BATCH_SIZE>=500
+COPY_MIN_ROWS = 500
+
+
+class _AnalysisBuffer:
+    """Collects validated analyses and writes them in batches.
+
+    Links are marked 'analyzed' only after their batch is committed, so a failed
+    write leaves them 'fetched' and they get retried on the next run.
+    """
+
+    def __init__(self, db: DBManager, batch_size: int, flush_seconds: float) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.pending: List[tuple] = []
+        self.saved = 0
+        self.failed = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, link_id: int, analysis: Dict[str, Any]) -> None:
+        self.pending.append((link_id, analysis))
+        if (len(self.pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        save = self.db.bulk_upsert_analysis if len(batch) >= COPY_MIN_ROWS else self.db.save_analysis_bulk
+        try:
+            save(batch)
+            self.db.update_links_status([link_id for link_id, _ in batch], "analyzed")
+            self.saved += len(batch)
+        except Exception as exc:
+            logger.error("✗ Failed to save %d analyses: %s", len(batch), exc)
+            self.failed += len(batch)
+
+
+class _AnalysisWriter(_AnalysisBuffer):
+    """_AnalysisBuffer fed through a queue and drained by its own thread.
+
+    add() never touches the DB; the thread writes a batch every batch_size items
+    or flush_seconds, whichever comes first. close() writes what is left.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db: DBManager, batch_size: int, flush_seconds: float) -> None:
+        super().__init__(db, batch_size, flush_seconds)
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="analysis-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, link_id: int, analysis: Dict[str, Any]) -> None:
+        self._queue.put((link_id, analysis))
+
+    def close(self) -> None:
+        self._queue.put(self._STOP)
+        self._thread.join()
+        # Only non-empty if the thread died mid-run: what it never wrote counts as failed
+        unwritten = len(self.pending)
+        self.pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                unwritten += 1
+        if unwritten:
+            logger.error("✗ Analysis writer stopped early, %d analyses not saved", unwritten)
+            self.failed += unwritten
+
+    def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(self.flush_seconds, 0.1))
+                except queue.Empty:
+                    self.flush()
+                    continue
+                if item is self._STOP:
+                    self.flush()
+                    return
+                super().add(*item)
+        except Exception:
+            # close() counts the unwritten rows as failed
+            logger.exception("✗ Analysis writer crashed")
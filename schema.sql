@@ -43,10 +43,13 @@ CREATE TABLE IF NOT EXISTS job_details (
     salary_rate TEXT,  -- hourly, monthly, yearly
     salary_type TEXT,  -- gross, net
 
-    -- Rich content (tech_stack 3rd from end, description 2nd from end)
+    -- Rich content
     tech_stack JSONB,
     description TEXT,
-    fetched_at TIMESTAMP DEFAULT NOW()
+    fetched_at TIMESTAMP DEFAULT NOW(),
+
+    -- Prompt body for phase 3 (description + tech stack), built once at fetch time
+    llm_content TEXT
 );
 
 -- ============================================================================
@@ -56,24 +59,36 @@ CREATE TABLE IF NOT EXISTS job_analysis (
     id SERIAL PRIMARY KEY,
     link_id INTEGER UNIQUE REFERENCES job_links(id) ON DELETE CASCADE,
 
+    -- Raw LLM output (summary, reasoning, scores) - the only column written besides decision.
+    -- Everything below is derived from it so views and indexes keep working.
+    scores_jsonb JSONB NOT NULL DEFAULT '{}',
+
     -- Summary
-    language TEXT,
-    short_summary TEXT,
+    language TEXT GENERATED ALWAYS AS (scores_jsonb->>'language') STORED,
+    short_summary TEXT GENERATED ALWAYS AS (scores_jsonb->>'short_summary') STORED,
 
     -- Risk scores (0-100, higher = worse)
-    cringe_score INTEGER CHECK (cringe_score BETWEEN 0 AND 100),
-    januszex_score INTEGER CHECK (januszex_score BETWEEN 0 AND 100),
+    cringe_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'cringe_score')::numeric)::int) STORED
+        CHECK (cringe_score BETWEEN 0 AND 100),
+    januszex_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'januszex_score')::numeric)::int) STORED
+        CHECK (januszex_score BETWEEN 0 AND 100),
 
     -- Quality scores (0-100, higher = better)
-    work_culture_score INTEGER CHECK (work_culture_score BETWEEN 0 AND 100),
-    stability_score INTEGER CHECK (stability_score BETWEEN 0 AND 100),
-    benefit_score INTEGER CHECK (benefit_score BETWEEN 0 AND 100),
-    lgbt_score INTEGER CHECK (lgbt_score BETWEEN 0 AND 100),
-    corpo_score INTEGER CHECK (corpo_score BETWEEN 0 AND 100),
+    work_culture_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'work_culture_score')::numeric)::int) STORED
+        CHECK (work_culture_score BETWEEN 0 AND 100),
+    stability_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'stability_score')::numeric)::int) STORED
+        CHECK (stability_score BETWEEN 0 AND 100),
+    benefit_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'benefit_score')::numeric)::int) STORED
+        CHECK (benefit_score BETWEEN 0 AND 100),
+    lgbt_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'lgbt_score')::numeric)::int) STORED
+        CHECK (lgbt_score BETWEEN 0 AND 100),
+    corpo_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'corpo_score')::numeric)::int) STORED
+        CHECK (corpo_score BETWEEN 0 AND 100),
 
     -- Fit analysis
-    fit_score INTEGER CHECK (fit_score BETWEEN 0 AND 100),
-    fit_reasoning TEXT,
+    fit_score INTEGER GENERATED ALWAYS AS (round((scores_jsonb->>'fit_score')::numeric)::int) STORED
+        CHECK (fit_score BETWEEN 0 AND 100),
+    fit_reasoning TEXT GENERATED ALWAYS AS (scores_jsonb->>'fit_reasoning') STORED,
 
     -- Final decision
     decision TEXT CHECK (decision IN ('APPLY', 'WATCH', 'IGNORE')),
@@ -2,45 +2,57 @@
 """Parse downloaded HTML pages into offers.json"""
 
 import json
+import mmap
 import re
 from pathlib import Path
+from typing import List
 
-pages_dir = Path("data/pages")
-offers = []
-seen_links = set()
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works the same
+    orjson = None
+
+# Matched on raw bytes: only the slugs get decoded, never the whole page
+_JOB_RE = re.compile(rb'job-offer/([^"<>\s]+)')
 
-for html_file in sorted(pages_dir.glob("*.html")):
-    with open(html_file, encoding="utf-8") as f:
-        html = f.read()
 
-    # Extract all job-offer links
-    links = re.findall(r'job-offer/([^"<>\s]+)', html)
+def _page_slugs(html_file: Path) -> List[bytes]:
+    """Job-offer slugs of one page, scanned straight from the page cache (no read() copy)"""
+    with open(html_file, "rb") as f:
+        if not html_file.stat().st_size:  # mmap can't map an empty file
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return [m.group(1) for m in _JOB_RE.finditer(buf)]
 
-    for link_slug in links:
-        full_link = f"https://justjoin.it/job-offer/{link_slug}"
 
-        if full_link in seen_links:
-            continue
-        seen_links.add(full_link)
+def _offer(slug: str) -> dict:
+    # Extract title from slug (best effort)
+    return {
+        "link": f"https://justjoin.it/job-offer/{slug}",
+        "title": slug.rsplit('-', 1)[0].replace('-', ' ').title(),
+        "company": None,
+        "location": None,
+        "salary": None,
+        "tags": []
+    }
 
-        # Extract title from slug (best effort)
-        parts = link_slug.rsplit('-', 1)
-        title = parts[0].replace('-', ' ').title() if parts else link_slug
 
-        offers.append({
-            "link": full_link,
-            "title": title,
-            "company": None,
-            "location": None,
-            "salary": None,
-            "tags": []
-        })
+pages_dir = Path("data/pages")
+
+# Extract all job-offer links; dict.fromkeys dedups in first-seen order with one hash op per slug
+slugs = dict.fromkeys(
+    slug for html_file in sorted(pages_dir.glob("*.html")) for slug in _page_slugs(html_file)
+)
+offers = [_offer(slug.decode("utf-8")) for slug in slugs]
 
 print(f"✓ Parsed {len(offers)} unique offers")
 
 # Save to JSON
 output_path = Path("data/offers.json")
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(offers, f, indent=2, ensure_ascii=False)
+if orjson is not None:
+    output_path.write_bytes(orjson.dumps(offers, option=orjson.OPT_INDENT_2))
+else:
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(offers, f, indent=2, ensure_ascii=False)
 
 print(f"✓ Saved to {output_path}")
@@ -8,6 +8,13 @@ from pathlib import Path
 
 from db.manager import DBManager
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works the same
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 def wipe_all(db: DBManager) -> None:
     """Wipe ALL tables (job_links + details + analysis)"""
@@ -63,8 +70,7 @@ def load_offers_from_json(db: DBManager) -> None:
         return
 
     # Load offers
-    with open(offers_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _json_loads(offers_file.read_bytes())
 
     # Handle both formats: list or dict with "offers" key
     if isinstance(data, list):
@@ -78,17 +84,11 @@ def load_offers_from_json(db: DBManager) -> None:
         print("⚠️  No offers found in offers.json")
         return
 
-    # Reload links
+    # Reload links (one multi-row INSERT, duplicates skipped by ON CONFLICT)
+    links = [offer.get("link") or offer.get("offer_url") for offer in offers]
+    links = [link for link in links if link]
     print(f"📥 Loading {len(offers)} links from {offers_file.name}...")
-    inserted = 0
-    for offer in offers:
-        link = offer.get("link") or offer.get("offer_url")
-        if link:
-            try:
-                db.insert_link(link)
-                inserted += 1
-            except Exception as e:
-                print(f"   ⚠️  Failed to insert {link}: {e}")
+    inserted = db.insert_links_bulk(links)
 
     print(f"✅ Loaded {inserted}/{len(offers)} links")
 